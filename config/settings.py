@@ -66,6 +66,7 @@ ALL_UNIVERSITIES = {
 # File Paths
 RAW_PAPERS_CSV = "data/raw/papers_raw.csv"
 PROCESSED_PAPERS_CSV = "data/processed/papers_processed.csv"
+PROCESSED_PAPERS_PARQUET = "data/processed/papers_processed.parquet"
 METADATA_CSV = "data/processed/metadata.csv"
 EMBEDDINGS_PATH = "data/processed/embeddings.npy"
 BERTOPIC_MODEL_PATH = "models/bertopic_model.pkl"
@@ -11,7 +11,7 @@ import plotly.express as px
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 # Import utilities and components
-from dashboard.utils.data_loader import load_data
+from dashboard.utils.data_loader import load_data, precompute_dashboard_aggregates
 from dashboard.components.filters import render_filters
 from dashboard.tabs.overview_tab import render_overview_tab
 from dashboard.tabs.theme_analysis_tab import render_theme_analysis_tab
@@ -185,7 +185,7 @@ def render_filter_summary():
             
             # Sub-theme filter
             st.markdown('<p style="color: #cbd5e1; font-weight: 600; margin-bottom: 0.5rem; font-size: 0.95rem;">Sub-Themes (Optional)</p>', unsafe_allow_html=True)
-            all_sub_themes = sorted([st for st in papers_df["sub_theme"].dropna().unique() if st])
+            all_sub_themes = precompute_dashboard_aggregates(papers_df)["sub_themes"]
             new_sel_sub_themes = st.multiselect("Sub-themes", options=all_sub_themes, default=sel_sub_themes, key=f"inline_sub_themes_{st.session_state.get('active_tab', 'overview')}", label_visibility="collapsed")
             
             st.divider()
@@ -193,8 +193,7 @@ def render_filter_summary():
             # University filter
             st.markdown('<p style="color: #cbd5e1; font-weight: 600; margin-bottom: 0.5rem; font-size: 0.95rem;">Universities</p>', unsafe_allow_html=True)
             australasian_uni_names = set(ALL_UNIVERSITIES.keys())
-            all_unis_in_data = papers_df["university"].unique()
-            all_unis = sorted([u for u in all_unis_in_data if u in australasian_uni_names])
+            all_unis = [u for u in precompute_dashboard_aggregates(papers_df)["universities"] if u in australasian_uni_names]
             
             select_all_unis = st.checkbox("Select All Universities", value=(len(sel_unis) == len(all_unis)), key=f"inline_all_unis_{st.session_state.get('active_tab', 'overview')}")
             if not select_all_unis:
@@ -4,6 +4,8 @@ Sidebar filter panel component.
 import streamlit as st
 import pandas as pd
 
+from dashboard.utils.data_loader import precompute_dashboard_aggregates
+
 
 def render_filters(papers_df, all_universities, strategic_themes):
     """
@@ -40,8 +42,11 @@ def render_filters(papers_df, all_universities, strategic_themes):
     all_themes = sorted(list(strategic_themes.keys()))
     sel_themes = st.sidebar.multiselect("Parent Themes", options=all_themes, default=all_themes, key="themes")
     
+    # Option lists come from the cached aggregates rather than re-scanning the columns per rerun
+    agg = precompute_dashboard_aggregates(papers_df)
+
     # Sub-theme filter (hierarchical)
-    all_sub_themes = sorted([st for st in papers_df["sub_theme"].dropna().unique() if st])
+    all_sub_themes = agg["sub_themes"]
     if all_sub_themes:
         sel_sub_themes = st.sidebar.multiselect(
             "Sub-Themes (optional)", 
@@ -55,8 +60,7 @@ def render_filters(papers_df, all_universities, strategic_themes):
     
     # University filter - only show AU/NZ institutions
     australasian_uni_names = set(all_universities.keys())
-    all_unis_in_data = papers_df["university"].unique()
-    all_unis = sorted([u for u in all_unis_in_data if u in australasian_uni_names])
+    all_unis = [u for u in agg["universities"] if u in australasian_uni_names]
     
     select_all_unis = st.sidebar.checkbox("All universities", value=True, key="all_unis_flag")
     if select_all_unis:
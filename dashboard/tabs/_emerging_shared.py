@@ -0,0 +1,246 @@
+"""
+Shared building blocks for the Emerging Topics tab variants.
+
+Both emerging_topics_tab.py and emerging_topics_tab_new.py render from these helpers,
+so they share one bubble-chart cache and one copy of the filtering/formatting logic.
+"""
+import os
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+
+from dashboard.utils.caching import FRAME_HASH_FUNCS
+from dashboard.utils.data_loader import _source_signature, normalized_name_map
+from dashboard.utils.insights import create_emerging_topics_bubble, topic_labels_signature
+from config.themes import STRATEGIC_THEMES
+
+
+# Static HTML fragments, built once at import instead of on every rerun
+AXIS_GUIDE_HTML = (
+    '<div style="padding: 0.5rem 1rem; background: rgba(59, 130, 246, 0.1); border-radius: 0.5rem; margin-bottom: 1rem;">'
+    '<span style="color: #93c5fd; font-size: 0.9rem;">'
+    '<strong>X-axis:</strong> Recency Score (higher = more recent) | '
+    '<strong>Y-axis:</strong> Growth Rate (higher = faster growth) | '
+    '<strong>Size:</strong> Number of papers | '
+    '<strong>Top-right:</strong> Hot emerging topics'
+    '</span>'
+    '</div>'
+)
+
+_CARD_HEADER_TEMPLATE = (
+    '<div style="background: linear-gradient(135deg, {start} 0%, {end} 100%); '
+    'padding: 1.25rem; border-radius: 12px; border: 1px solid {border};{extra_style}">'
+    '<div style="display: flex; align-items: center; margin-bottom: 1rem;">'
+    '<span style="font-size: 2rem; margin-right: 0.5rem;">{icon}</span>'
+    '<h3 style="color: {title_color}; margin: 0; font-size: 1.1rem;">{title}</h3>'
+    '</div>'
+    '<p style="color: {subtitle_color}; font-size: 0.85rem; margin-bottom: 1rem;">{subtitle}</p>'
+)
+
+_CARD_STYLES = {
+    "hot": dict(start="#064e3b", end="#065f46", border="#059669", icon="🔥",
+                title_color="#6ee7b7", title="Hottest Topics",
+                subtitle_color="#d1fae5", subtitle="High recency + High growth"),
+    "momentum": dict(start="#1e3a8a", end="#1e40af", border="#3b82f6", icon="📈",
+                     title_color="#93c5fd", title="Momentum Leaders",
+                     subtitle_color="#bfdbfe", subtitle="Highest growth rates"),
+    "recent": dict(start="#78350f", end="#92400e", border="#f59e0b", icon="⚡",
+                   title_color="#fcd34d", title="Recent Surges",
+                   subtitle_color="#fef3c7", subtitle="Highest recency scores"),
+}
+
+# Card headers for both layouts: the plain cards and the fixed-height variant
+CARD_HEADERS_HTML = {
+    key: _CARD_HEADER_TEMPLATE.format(extra_style="", **style) for key, style in _CARD_STYLES.items()
+}
+FIXED_HEIGHT_CARD_HEADERS_HTML = {
+    key: _CARD_HEADER_TEMPLATE.format(extra_style=" min-height: 280px;", **style) for key, style in _CARD_STYLES.items()
+}
+
+_THEME_OPTIONS = ("All Themes",) + tuple(t.replace("_", " ").title() for t in STRATEGIC_THEMES.keys())
+
+NO_HOT_TOPICS_HTML = '<p style="color: #94a3b8; font-size: 0.85rem;">No topics in hot quadrant</p>'
+
+
+def render_emerging_filters(papers_df, start_date, end_date):
+    """
+    Render the top-N / theme controls and the "Analyzing N papers" banner.
+
+    Returns:
+        Tuple of (emerging_data, top_n)
+    """
+    st.markdown('<p class="sub-header">Emerging Research Topics</p>', unsafe_allow_html=True)
+    st.markdown("*Identify hot topics based on recency, growth rate, and publication volume*")
+
+    # Controls
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        top_n = st.slider("Number of Topics to Show", 10, 30, 20, step=5)
+    with col2:
+        # Theme selection
+        selected_themes = st.multiselect(
+            "Select Themes to Analyze",
+            options=_THEME_OPTIONS,
+            default=["All Themes"]
+        )
+
+    emerging_data, themes_count = filter_by_theme_date(papers_df, selected_themes, start_date, end_date)
+
+    st.markdown(
+        f'<div style="padding: 0.75rem; background: #1e3a5f; border-left: 4px solid #3b82f6; border-radius: 0.5rem; margin: 1rem 0;">'
+        f'<span style="color: #93c5fd;">📊 Analyzing <strong style="color: #60a5fa;">{len(emerging_data):,}</strong> papers across '
+        f'<strong style="color: #60a5fa;">{themes_count}</strong> theme(s)</span>'
+        f'</div>',
+        unsafe_allow_html=True
+    )
+
+    st.markdown("<div class='divider'></div>", unsafe_allow_html=True)
+    return emerging_data, top_n
+
+
+def filter_by_theme_date(papers_df, selected_themes, start_date, end_date):
+    """
+    Restrict papers to the selected display themes and date range.
+
+    Returns:
+        Tuple of (emerging_data, themes_count)
+    """
+    if "All Themes" in selected_themes or not selected_themes:
+        emerging_data = papers_df.copy()
+        emerging_data = emerging_data[(emerging_data["date"].dt.date >= start_date) & (emerging_data["date"].dt.date <= end_date)]
+        themes_count = emerging_data['theme'].nunique()
+    else:
+        # Convert back to original theme format
+        theme_map = normalized_name_map(papers_df["theme"])
+        raw_themes = [
+            theme_map[key] for key in (selected.replace(" ", "_").lower() for selected in selected_themes) if key in theme_map
+        ]
+
+        emerging_data = papers_df[papers_df["theme"].isin(raw_themes)].copy()
+        emerging_data = emerging_data[(emerging_data["date"].dt.date >= start_date) & (emerging_data["date"].dt.date <= end_date)]
+        themes_count = len(raw_themes)
+    return emerging_data, themes_count
+
+
+@st.cache_data(persist="disk", max_entries=64, show_spinner=False, hash_funcs=FRAME_HASH_FUNCS)
+def _bubble_and_df(emerging_data, mapping_sig, labels_sig, has_api_key, top_n, _mapping):
+    """
+    Disk-persisted wrapper around create_emerging_topics_bubble.
+
+    The filtered frame is keyed with frame_fingerprint rather than Streamlit's full
+    content hash. The mapping is not hashed itself; mapping_sig is the (path, mtime_ns, size)
+    signature of the data files and labels_sig the stat of the topic label cache, so edits
+    to either invalidate the entry even though the disk cache has no expiry.
+    """
+    return create_emerging_topics_bubble(emerging_data, _mapping, top_n=top_n)
+
+
+def get_emerging_bubble(emerging_data, mapping, top_n):
+    """Return (bubble_fig, emerging_df) for the filtered papers, served from the shared cache."""
+    # Without an API key every label is a keyword fallback, so key presence is part of the key
+    has_api_key = bool(os.getenv("OPENAI_API_KEY"))
+    args = (emerging_data, _source_signature(), topic_labels_signature(), has_api_key, top_n, mapping)
+    # UI stays out of the cached function, so a cache hit doesn't replay stale messages
+    with st.spinner('Generating topic labels (using cached where available)...'):
+        bubble_fig, emerging_df = _bubble_and_df(*args)
+
+    label_counts = emerging_df["label_source"].value_counts()
+    fallback_count = label_counts.get("keywords", 0)
+    if has_api_key and fallback_count:
+        # Some GPT requests failed: drop the entry so the next rerun retries them
+        _bubble_and_df.clear(*args)
+
+    # Show cache statistics
+    if len(emerging_df) > 0:
+        message = (
+            f"✅ Topic labels ready: {label_counts.get('cache', 0)} from cache, "
+            f"{label_counts.get('gpt', 0)} newly generated"
+        )
+        if fallback_count:
+            message += f", {fallback_count} keyword fallback (retried next run)"
+        st.success(message)
+    return bubble_fig, emerging_df
+
+
+def compute_insights(emerging_df):
+    """
+    Select the topics shown in the three Strategic Insights cards.
+
+    Returns:
+        Tuple of (hot_topics, momentum_topics, recent_topics)
+    """
+    recency = emerging_df['recency_score'].to_numpy()
+    growth = emerging_df['growth_rate'].to_numpy()
+    hot_idx = np.flatnonzero((recency > np.nanmedian(recency)) & (growth > np.nanmedian(growth)))[:5]
+    # Stable sort keeps the first row on ties, matching DataFrame.nlargest
+    momentum_idx = np.argsort(-growth, kind='stable')[:5]
+    recent_idx = np.argsort(-recency, kind='stable')[:5]
+    return emerging_df.iloc[hot_idx], emerging_df.iloc[momentum_idx], emerging_df.iloc[recent_idx]
+
+
+def render_strategic_insights(emerging_df, fixed_height=False):
+    """Render the Hottest Topics / Momentum Leaders / Recent Surges cards."""
+    headers = FIXED_HEIGHT_CARD_HEADERS_HTML if fixed_height else CARD_HEADERS_HTML
+    hot_topics, momentum_topics, recent_topics = compute_insights(emerging_df)
+
+    st.markdown('<p class="sub-header">Strategic Insights</p>', unsafe_allow_html=True)
+
+    col1, col2, col3 = st.columns(3)
+
+    # Each card is sent as a single HTML block so the items nest inside the card wrapper
+    with col1:
+        card_html = [headers["hot"]]
+        if len(hot_topics) > 0:
+            for idx, topic in hot_topics.iterrows():
+                card_html.append(
+                    f'<div style="background: rgba(16, 185, 129, 0.1); padding: 0.5rem; '
+                    f'border-radius: 6px; margin-bottom: 0.5rem; border-left: 3px solid #10b981;">'
+                    f'<div style="color: #d1fae5; font-weight: 600; font-size: 0.9rem;">{topic["topic_label"]}</div>'
+                    f'<div style="color: #6ee7b7; font-size: 0.75rem;">{topic["theme"].replace("_", " ")} • {topic["paper_count"]} papers</div>'
+                    f'</div>'
+                )
+        else:
+            card_html.append(NO_HOT_TOPICS_HTML)
+        card_html.append('</div>')
+        st.markdown(''.join(card_html), unsafe_allow_html=True)
+
+    with col2:
+        card_html = [headers["momentum"]]
+        for idx, topic in momentum_topics.iterrows():
+            card_html.append(
+                f'<div style="background: rgba(59, 130, 246, 0.1); padding: 0.5rem; '
+                f'border-radius: 6px; margin-bottom: 0.5rem; border-left: 3px solid #3b82f6;">'
+                f'<div style="color: #bfdbfe; font-weight: 600; font-size: 0.9rem;">{topic["topic_label"]}</div>'
+                f'<div style="color: #93c5fd; font-size: 0.75rem;">Growth: {topic["growth_rate"]:.1f}% • {topic["paper_count"]} papers</div>'
+                f'</div>'
+            )
+        card_html.append('</div>')
+        st.markdown(''.join(card_html), unsafe_allow_html=True)
+
+    with col3:
+        card_html = [headers["recent"]]
+        for idx, topic in recent_topics.iterrows():
+            card_html.append(
+                f'<div style="background: rgba(245, 158, 11, 0.1); padding: 0.5rem; '
+                f'border-radius: 6px; margin-bottom: 0.5rem; border-left: 3px solid #f59e0b;">'
+                f'<div style="color: #fef3c7; font-weight: 600; font-size: 0.9rem;">{topic["topic_label"]}</div>'
+                f'<div style="color: #fcd34d; font-size: 0.75rem;">Recency: {topic["recency_score"]:.1f}% • {topic["paper_count"]} papers</div>'
+                f'</div>'
+            )
+        card_html.append('</div>')
+        st.markdown(''.join(card_html), unsafe_allow_html=True)
+
+
+def build_display_df(emerging_df):
+    """Build the Top Emerging Topics table; numeric formatting is left to column_config."""
+    return pd.DataFrame({
+        'Rank': np.arange(1, len(emerging_df) + 1),
+        'Topic': emerging_df['topic_label'].str.title().to_numpy(),
+        'Theme': emerging_df['theme'].str.replace('_', ' ').str.title().to_numpy(),
+        'Sub-Theme': emerging_df['sub_theme'].fillna('—').str.replace('_', ' ').str.title().to_numpy(),
+        'Papers': emerging_df['paper_count'].to_numpy(),
+        'Recency %': np.round(emerging_df['recency_score'].to_numpy(), 1),
+        'Growth %': np.round(emerging_df['growth_rate'].to_numpy(), 1),
+        'Avg Citations': np.round(emerging_df['avg_citations'].to_numpy(), 1),
+    })
@@ -2,15 +2,99 @@
 Overview tab - Key insights, metrics, and research hierarchy.
 """
 import streamlit as st
+import numpy as np
+import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
 
 from dashboard.utils.visualizations import create_sunburst_chart
-from dashboard.utils.styling import create_section_header, apply_fig_theme
+from dashboard.utils.styling import create_section_header, apply_fig_theme, pretty_name
 from dashboard.utils.insights import generate_insights
+from dashboard.utils.caching import FRAME_HASH_FUNCS
+from dashboard.utils.data_loader import precompute_dashboard_aggregates
 from config.themes import STRATEGIC_THEMES
 
 
+_THEME_ORDER = tuple(STRATEGIC_THEMES.keys())
+
+# Modern gradient colors by type - Dark Blue theme with light text
+_INSIGHT_GRADIENTS = {
+    "emerging": "linear-gradient(135deg, #1e3a8a 0%, #1e40af 100%)",
+    "opportunity": "linear-gradient(135deg, #164e63 0%, #0c4a6e 100%)",
+    "concentration": "linear-gradient(135deg, #92400e 0%, #b45309 100%)",
+    "quality": "linear-gradient(135deg, #5b21b6 0%, #6d28d9 100%)",
+    "trend": "linear-gradient(135deg, #1e40af 0%, #2563eb 100%)",
+    "collaboration": "linear-gradient(135deg, #831843 0%, #9f1239 100%)"
+}
+_DEFAULT_INSIGHT_GRADIENT = "linear-gradient(135deg, #1e293b 0%, #334155 100%)"
+
+_INSIGHT_BORDERS = {
+    "emerging": "#3b82f6",
+    "opportunity": "#2563eb",
+    "concentration": "#f59e0b",
+    "quality": "#8b5cf6",
+    "trend": "#06b6d4",
+    "collaboration": "#ec4899"
+}
+_DEFAULT_INSIGHT_BORDER = "#64748b"
+
+_INSIGHT_CARD_TMPL = """<div class='card' style='background:{bg}; border-left: 4px solid {border}; min-height: 180px;'>
+                        <div style='font-size:2.5em; margin-bottom:0.75em;'>{icon}</div>
+                        <div style='font-weight:700; color:#f1f5f9; margin-bottom:0.5em; font-size:1.1rem;'>{title}</div>
+                        <div style='color:#cbd5e1; margin-bottom:0.75em; line-height:1.6;'>{message}</div>
+                        <div style='font-size:0.875em; color:#94a3b8; font-style:italic; padding-top:0.5em; border-top:1px solid rgba(241,245,249,0.2);'>{detail}</div>
+                    </div>"""
+
+
+@st.cache_data(show_spinner=False, hash_funcs=FRAME_HASH_FUNCS)
+def _cached_insights(papers_df, trends, mapping):
+    """generate_insights memoized per data version so widget reruns skip it."""
+    return generate_insights(papers_df, trends, mapping)
+
+
+@st.cache_data(show_spinner=False, hash_funcs=FRAME_HASH_FUNCS)
+def _sunburst_json(filtered, mapping):
+    """Plotly JSON for the hierarchy sunburst, cached per filtered view."""
+    return create_sunburst_chart(filtered, mapping).to_json()
+
+
+@st.cache_data(show_spinner=False, hash_funcs=FRAME_HASH_FUNCS)
+def _theme_counts_bar_json(theme_counts):
+    """Plotly JSON for the papers-per-theme bar chart."""
+    # Sort ascending so top is at top
+    theme_counts_sorted = theme_counts.sort_values(ascending=True)
+    fig = px.bar(
+        x=theme_counts_sorted.values,
+        y=[pretty_name(t) for t in theme_counts_sorted.index],
+        orientation="h",
+        color=theme_counts_sorted.values,
+        color_continuous_scale="Blues",
+        title=" ",
+        labels={"x": "Papers", "y": "Strategic Theme", "color": "Papers"}
+    )
+    fig = apply_fig_theme(fig, height=380)
+    return fig.to_json()
+
+
+@st.cache_data(show_spinner=False)
+def _sub_theme_bar_json(rows):
+    """Plotly JSON for the top sub-themes bar; rows are (sub_theme, papers, avg_confidence) tuples."""
+    sub_theme_summary = pd.DataFrame(list(rows), columns=["sub_theme", "papers", "avg_confidence"])
+    fig = px.bar(
+        sub_theme_summary,
+        x="papers",
+        y="sub_theme",
+        orientation="h",
+        color="avg_confidence",
+        color_continuous_scale="Blues",
+        title=" ",
+        labels={"papers": "Papers", "sub_theme": "Sub-Theme", "avg_confidence": "Avg Confidence (%)"}
+    )
+    fig = apply_fig_theme(fig, height=420)
+    return fig.to_json()
+
+
 def render_overview_tab(filtered, papers_df, trends, mapping):
     """
     Render the Overview tab content.
@@ -22,7 +106,8 @@ def render_overview_tab(filtered, papers_df, trends, mapping):
         mapping: Topic mapping data
     """
     # Generate insights
-    insights = generate_insights(papers_df, trends, mapping)
+    insights = _cached_insights(papers_df, trends, mapping)
+    agg = precompute_dashboard_aggregates(papers_df)
     
     # === KEY INSIGHTS SECTION ===
     st.markdown(create_section_header(
@@ -32,42 +117,22 @@ def render_overview_tab(filtered, papers_df, trends, mapping):
     ), unsafe_allow_html=True)
     
     if insights:
-        # Show insights in a grid with modern cards
-        insight_cols = st.columns(min(len(insights), 3))
+        # Show insights in a grid with modern cards, one markdown block per column
+        n_cols = min(len(insights), 3)
+        insight_cols = st.columns(n_cols)
+        column_html = [[] for _ in range(n_cols)]
         for idx, insight in enumerate(insights):
-            col = insight_cols[idx % 3]
-            
-            # Modern gradient colors by type - Dark Blue theme with light text
-            gradient_colors = {
-                "emerging": "linear-gradient(135deg, #1e3a8a 0%, #1e40af 100%)",
-                "opportunity": "linear-gradient(135deg, #164e63 0%, #0c4a6e 100%)",
-                "concentration": "linear-gradient(135deg, #92400e 0%, #b45309 100%)",
-                "quality": "linear-gradient(135deg, #5b21b6 0%, #6d28d9 100%)",
-                "trend": "linear-gradient(135deg, #1e40af 0%, #2563eb 100%)",
-                "collaboration": "linear-gradient(135deg, #831843 0%, #9f1239 100%)"
-            }
-            bg = gradient_colors.get(insight['type'], "linear-gradient(135deg, #1e293b 0%, #334155 100%)")
-            
-            border_colors = {
-                "emerging": "#3b82f6",
-                "opportunity": "#2563eb",
-                "concentration": "#f59e0b",
-                "quality": "#8b5cf6",
-                "trend": "#06b6d4",
-                "collaboration": "#ec4899"
-            }
-            border = border_colors.get(insight['type'], "#64748b")
-            
+            column_html[idx % 3].append(_INSIGHT_CARD_TMPL.format_map({
+                "bg": _INSIGHT_GRADIENTS.get(insight['type'], _DEFAULT_INSIGHT_GRADIENT),
+                "border": _INSIGHT_BORDERS.get(insight['type'], _DEFAULT_INSIGHT_BORDER),
+                "icon": insight['icon'],
+                "title": insight['title'],
+                "message": insight['message'],
+                "detail": insight['detail'],
+            }))
+        for col, parts in zip(insight_cols, column_html):
             with col:
-                st.markdown(
-                    f"""<div class='card' style='background:{bg}; border-left: 4px solid {border}; min-height: 180px;'>
-                        <div style='font-size:2.5em; margin-bottom:0.75em;'>{insight['icon']}</div>
-                        <div style='font-weight:700; color:#f1f5f9; margin-bottom:0.5em; font-size:1.1rem;'>{insight['title']}</div>
-                        <div style='color:#cbd5e1; margin-bottom:0.75em; line-height:1.6;'>{insight['message']}</div>
-                        <div style='font-size:0.875em; color:#94a3b8; font-style:italic; padding-top:0.5em; border-top:1px solid rgba(241,245,249,0.2);'>{insight['detail']}</div>
-                    </div>""",
-                    unsafe_allow_html=True
-                )
+                st.markdown("\n".join(parts), unsafe_allow_html=True)
     else:
         st.info("Analyzing research patterns to generate insights...")
     
@@ -88,12 +153,14 @@ def render_overview_tab(filtered, papers_df, trends, mapping):
     with k2:
         st.metric("Research Topics", len(mapping), delta=None)
     with k3:
-        st.metric("Sub-Themes", papers_df["sub_theme"].nunique(), delta=None)
+        st.metric("Sub-Themes", agg["n_sub_themes"], delta=None)
     with k4:
-        st.metric("Universities", papers_df["university"].nunique(), delta=None)
+        st.metric("Universities", agg["n_universities"], delta=None)
     with k5:
         try:
-            avg_growth = sum(p.get("growth_rate", 0) for p in trends.get("strategic_priorities", [])) / max(1, len(trends.get("strategic_priorities", [])))
+            priorities = trends.get("strategic_priorities", [])
+            rates = np.fromiter((p.get("growth_rate", 0.0) for p in priorities), dtype=np.float64, count=len(priorities))
+            avg_growth = rates.mean() if rates.size else 0.0
             st.metric("Avg Growth Rate", f"{avg_growth*100:+.1f}%", delta=f"{avg_growth*100:.1f}%")
         except Exception:
             st.metric("Avg Growth Rate", "N/A", delta=None)
@@ -110,7 +177,7 @@ def render_overview_tab(filtered, papers_df, trends, mapping):
     st.markdown("*Click on any segment to zoom in. Click the center to zoom out. All themes and sub-themes are displayed.*")
     
     try:
-        sunburst_fig = create_sunburst_chart(filtered, mapping)
+        sunburst_fig = pio.from_json(_sunburst_json(filtered, mapping))
         st.plotly_chart(sunburst_fig, use_container_width=True, key="overview_sunburst")
     except Exception as e:
         st.error(f"Could not generate hierarchy chart: {str(e)}")
@@ -119,53 +186,30 @@ def render_overview_tab(filtered, papers_df, trends, mapping):
 
     # Papers per Theme Distribution
     st.markdown('<p class="sub-header">Papers per Strategic Theme</p>', unsafe_allow_html=True)
-    theme_counts = papers_df.groupby("theme").size()
-    theme_counts = theme_counts.reindex(list(STRATEGIC_THEMES.keys()), fill_value=0)
-    # Sort ascending so top is at top
-    theme_counts_sorted = theme_counts.sort_values(ascending=True)
-    fig = px.bar(
-        x=theme_counts_sorted.values,
-        y=[t.replace("_", " ").title() for t in theme_counts_sorted.index],
-        orientation="h",
-        color=theme_counts_sorted.values,
-        color_continuous_scale="Blues",
-        title=" ",
-        labels={"x": "Papers", "y": "Strategic Theme", "color": "Papers"}
-    )
-    fig = apply_fig_theme(fig, height=380)
-    st.plotly_chart(fig, use_container_width=True)
+    theme_counts = agg["theme_counts"]
+    theme_counts = theme_counts.reindex(_THEME_ORDER, fill_value=0)
+    st.plotly_chart(pio.from_json(_theme_counts_bar_json(theme_counts)), use_container_width=True)
 
     st.markdown("<div class='divider'></div>", unsafe_allow_html=True)
 
     # SUB-THEME OVERVIEW
     st.markdown('<p class="sub-header">Top Sub-Themes (Hierarchical Analysis)</p>', unsafe_allow_html=True)
-    papers_with_sub = papers_df[papers_df["sub_theme"].notna()]
-    if not papers_with_sub.empty:
-        sub_theme_summary = papers_with_sub.groupby("sub_theme").agg(
-            papers=("title", "count"),
-            avg_confidence=("sub_theme_confidence", "mean")
-        ).sort_values("papers", ascending=True).tail(15).reset_index()  # Changed to ascending=True and tail() to get top items in correct order
+    papers_with_sub_count = agg["papers_with_sub_theme"]
+    if papers_with_sub_count > 0:
+        sub_theme_summary = agg["sub_theme_summary"].nlargest(15, "papers").sort_values("papers").reset_index()  # Ascending so the top items plot at the top
         sub_theme_summary["sub_theme"] = sub_theme_summary["sub_theme"].str.replace("_", " ").str.title()
         sub_theme_summary["avg_confidence"] = (sub_theme_summary["avg_confidence"] * 100).round(1)
         
-        fig_sub_overview = px.bar(
-            sub_theme_summary,
-            x="papers",
-            y="sub_theme",
-            orientation="h",
-            color="avg_confidence",
-            color_continuous_scale="Blues",
-            title=" ",
-            labels={"papers": "Papers", "sub_theme": "Sub-Theme", "avg_confidence": "Avg Confidence (%)"}
-        )
-        fig_sub_overview = apply_fig_theme(fig_sub_overview, height=420)
+        fig_sub_overview = pio.from_json(_sub_theme_bar_json(
+            tuple(sub_theme_summary[["sub_theme", "papers", "avg_confidence"]].itertuples(index=False, name=None))
+        ))
         st.plotly_chart(fig_sub_overview, use_container_width=True)
         
         # Sub-theme statistics
         col1, col2, col3 = st.columns(3)
-        col1.metric("Unique Sub-Themes", len(papers_with_sub["sub_theme"].unique()))
-        col2.metric("Papers with Sub-Themes", f"{len(papers_with_sub):,}")
-        col3.metric("Coverage", f"{(len(papers_with_sub)/len(papers_df)*100):.1f}%")
+        col1.metric("Unique Sub-Themes", len(agg["sub_theme_summary"]))
+        col2.metric("Papers with Sub-Themes", f"{papers_with_sub_count:,}")
+        col3.metric("Coverage", f"{(papers_with_sub_count/len(papers_df)*100):.1f}%")
     else:
         st.info("No sub-theme data available in the dataset")
 
@@ -173,9 +217,8 @@ def render_overview_tab(filtered, papers_df, trends, mapping):
 
     # Overall Output Over Time
     st.markdown('<p class="sub-header">Overall Research Activity</p>', unsafe_allow_html=True)
-    qa = papers_df.groupby("quarter").size().reset_index(name="count")
+    qa = agg["quarter_counts"].rename_axis("quarter").reset_index(name="count")
     if not qa.empty:
-        qa["quarter"] = qa["quarter"].astype(str)
         fig_overall = go.Figure()
         fig_overall.add_trace(go.Scatter(x=qa["quarter"], y=qa["count"], mode="lines+markers", name="All Themes"))
         fig_overall = apply_fig_theme(fig_overall, height=360)
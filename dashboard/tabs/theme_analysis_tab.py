@@ -1,167 +1,236 @@
 """
 Theme Analysis tab - Detailed theme breakdown, publication trends, and sub-theme analysis.
 """
+import heapq
+
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
+import plotly.io as pio
 
 from dashboard.utils.visualizations import create_trend_timeline, create_sankey_flow
-from dashboard.utils.styling import create_section_header, apply_fig_theme
+from dashboard.utils.styling import create_section_header, apply_fig_theme, pretty_name
+from dashboard.utils.data_loader import precompute_dashboard_aggregates
+from dashboard.utils.caching import FRAME_HASH_FUNCS
+
+
+@st.cache_data(show_spinner=False, hash_funcs=FRAME_HASH_FUNCS)
+def _trend_timeline_json(filtered):
+    """Plotly JSON for the publication timeline, cached per filtered view."""
+    return create_trend_timeline(filtered).to_json()
+
+
+@st.cache_data(show_spinner=False, hash_funcs=FRAME_HASH_FUNCS)
+def _sankey_flow_json(filtered):
+    """Plotly JSON for the theme -> sub-theme -> university flow, cached per filtered view."""
+    return create_sankey_flow(filtered).to_json()
+
+
+@st.cache_data(show_spinner=False)
+def _theme_sub_bar_json(rows, theme_display):
+    """Plotly JSON for a theme's top sub-themes; rows are (sub_theme, papers, avg_confidence) tuples."""
+    top_10_sub = pd.DataFrame(list(rows), columns=["Sub-Theme", "Papers", "Avg Confidence (%)"])
+    fig = px.bar(
+        top_10_sub,
+        x="Papers",
+        y="Sub-Theme",
+        orientation="h",
+        color="Avg Confidence (%)",
+        color_continuous_scale="Blues",
+        title=f"Top 10 Sub-Themes in {theme_display}"
+    )
+    fig = apply_fig_theme(fig, height=340)
+    return fig.to_json()
+
+
+@st.cache_data(show_spinner=False)
+def _theme_university_bar_json(counts, theme_display):
+    """Plotly JSON for a theme's top universities; counts are (university, papers) tuples."""
+    names = [name for name, _ in counts]
+    values = [n for _, n in counts]
+    fig = px.bar(x=values, y=names, orientation="h", color=values, color_continuous_scale="Blues", title=f"Top 10 Universities in {theme_display}")
+    fig = apply_fig_theme(fig, height=340)
+    return fig.to_json()
 
 
-def find_adjacent_themes(papers: pd.DataFrame, theme_key: str, mapping_obj: dict) -> dict:
-    """Find themes adjacent to the selected theme based on keyword overlap."""
+@st.cache_resource(max_entries=2, show_spinner=False, hash_funcs=FRAME_HASH_FUNCS)
+def _theme_groups(papers_df):
+    """
+    Per-theme views of the papers, split once so a theme change is a dict lookup.
+
+    Maps theme -> (theme_papers, theme_papers_with_sub_theme). Held as a resource
+    rather than cache_data so the frames are shared, not unpickled on every rerun;
+    callers must treat them as read-only. Each entry is a full copy of the papers and
+    the key changes at least daily (recency scores), so only the current and previous
+    data versions are kept.
+    """
+    groups = {}
+    for theme, theme_papers in papers_df.groupby("theme", observed=True):
+        groups[theme] = (theme_papers, theme_papers.loc[theme_papers["sub_theme"].notna().to_numpy()])
+    return groups
+
+
+def find_adjacent_themes(papers: pd.DataFrame, theme_key: str, mapping_obj: dict, k: int = 5) -> list[tuple[str, int]]:
+    """Find the k themes most adjacent to the selected theme based on keyword overlap, as (theme, overlap) pairs."""
     adjacent: dict[str, int] = {}
     theme_p = papers[papers["theme"] == theme_key]
-    for _, p in theme_p.iterrows():
-        kw = set(mapping_obj.get(str(p["topic_id"]), {}).get("keywords", []))
-        for _, data in mapping_obj.items():
-            other_theme = data.get("theme")
-            if not other_theme or other_theme in (theme_key, "Other"):
-                continue
-            overlap = len(kw & set(data.get("keywords", [])))
+    # Build each topic's keyword set once instead of once per paper
+    kw_by_topic = {tid: frozenset(data.get("keywords", ())) for tid, data in mapping_obj.items()}
+    others = [
+        (data.get("theme"), kw_by_topic[tid])
+        for tid, data in mapping_obj.items()
+        if data.get("theme") and data.get("theme") not in (theme_key, "Other")
+    ]
+    # Papers sharing a topic contribute identical overlaps, so weight each topic by its paper count
+    codes, topic_ids = pd.factorize(theme_p["topic_id"].to_numpy())
+    topic_counts = np.bincount(codes[codes >= 0], minlength=len(topic_ids))
+    for tid, mult in zip(topic_ids, topic_counts):
+        kw = kw_by_topic.get(str(tid), frozenset())
+        for other_theme, okw in others:
+            overlap = len(kw & okw)
             if overlap > 0:
-                adjacent[other_theme] = adjacent.get(other_theme, 0) + overlap
-    return dict(sorted(adjacent.items(), key=lambda x: x[1], reverse=True))
+                adjacent[other_theme] = adjacent.get(other_theme, 0) + overlap * mult
+    return heapq.nlargest(k, adjacent.items(), key=lambda x: x[1])
 
 
-def get_growth_color_style_theme(growth_rate):
-    """Generate super dark color gradients based on growth rate for dark theme"""
-    growth_pct = growth_rate * 100
-    
-    if growth_pct >= 50:
-        return {
-            "bg": "linear-gradient(135deg, #052e16 0%, #064e3b 100%)",  # Super dark green
-            "border": "#10b981",
-            "icon": "▲▲",
-            "label": f"+{growth_pct:.0f}%",
-            "color": "#ffffff",
-            "icon_color": "#34d399"
-        }
-    elif growth_pct >= 20:
-        return {
-            "bg": "linear-gradient(135deg, #064e3b 0%, #065f46 100%)",  # Super dark green
-            "border": "#34d399",
-            "icon": "▲",
-            "label": f"+{growth_pct:.0f}%",
-            "color": "#ffffff",
-            "icon_color": "#6ee7b7"
-        }
-    elif growth_pct >= 5:
-        return {
-            "bg": "linear-gradient(135deg, #065f46 0%, #047857 100%)",  # Dark green
-            "border": "#6ee7b7",
-            "icon": "▲",
-            "label": f"+{growth_pct:.0f}%",
-            "color": "#ffffff",
-            "icon_color": "#a7f3d0"
-        }
-    elif growth_pct >= 0:
-        return {
-            "bg": "linear-gradient(135deg, #047857 0%, #059669 100%)",  # Dark green
-            "border": "#a7f3d0",
-            "icon": "→",
-            "label": f"+{growth_pct:.1f}%",
-            "color": "#ffffff",
-            "icon_color": "#d1fae5"
-        }
-    elif growth_pct >= -5:
-        return {
-            "bg": "linear-gradient(135deg, #7f1d1d 0%, #991b1b 100%)",  # Super dark red
-            "border": "#fca5a5",
-            "icon": "→",
-            "label": f"{growth_pct:.1f}%",
-            "color": "#ffffff",
-            "icon_color": "#fca5a5"
-        }
-    elif growth_pct >= -20:
-        return {
-            "bg": "linear-gradient(135deg, #450a0a 0%, #7f1d1d 100%)",  # Super dark red
-            "border": "#f87171",
-            "icon": "▼",
-            "label": f"{growth_pct:.0f}%",
-            "color": "#ffffff",
-            "icon_color": "#f87171"
-        }
-    else:
-        return {
-            "bg": "linear-gradient(135deg, #1a0000 0%, #450a0a 100%)",  # Extremely dark red
-            "border": "#ef4444",
-            "icon": "▼▼",
-            "label": f"{growth_pct:.0f}%",
-            "color": "#ffffff",
-            "icon_color": "#ef4444"
-        }
+# Growth-rate buckets for the priority cards: (lower bound in %, style, label format).
+# Styles are built once at import; only the label depends on the actual rate.
+_GROWTH_STYLE_BUCKETS = (
+    (50, {
+        "bg": "linear-gradient(135deg, #052e16 0%, #064e3b 100%)",  # Super dark green
+        "border": "#10b981",
+        "icon": "▲▲",
+        "color": "#ffffff",
+        "icon_color": "#34d399"
+    }, "+{:.0f}%"),
+    (20, {
+        "bg": "linear-gradient(135deg, #064e3b 0%, #065f46 100%)",  # Super dark green
+        "border": "#34d399",
+        "icon": "▲",
+        "color": "#ffffff",
+        "icon_color": "#6ee7b7"
+    }, "+{:.0f}%"),
+    (5, {
+        "bg": "linear-gradient(135deg, #065f46 0%, #047857 100%)",  # Dark green
+        "border": "#6ee7b7",
+        "icon": "▲",
+        "color": "#ffffff",
+        "icon_color": "#a7f3d0"
+    }, "+{:.0f}%"),
+    (0, {
+        "bg": "linear-gradient(135deg, #047857 0%, #059669 100%)",  # Dark green
+        "border": "#a7f3d0",
+        "icon": "→",
+        "color": "#ffffff",
+        "icon_color": "#d1fae5"
+    }, "+{:.1f}%"),
+    (-5, {
+        "bg": "linear-gradient(135deg, #7f1d1d 0%, #991b1b 100%)",  # Super dark red
+        "border": "#fca5a5",
+        "icon": "→",
+        "color": "#ffffff",
+        "icon_color": "#fca5a5"
+    }, "{:.1f}%"),
+    (-20, {
+        "bg": "linear-gradient(135deg, #450a0a 0%, #7f1d1d 100%)",  # Super dark red
+        "border": "#f87171",
+        "icon": "▼",
+        "color": "#ffffff",
+        "icon_color": "#f87171"
+    }, "{:.0f}%"),
+    (float("-inf"), {
+        "bg": "linear-gradient(135deg, #1a0000 0%, #450a0a 100%)",  # Extremely dark red
+        "border": "#ef4444",
+        "icon": "▼▼",
+        "color": "#ffffff",
+        "icon_color": "#ef4444"
+    }, "{:.0f}%"),
+)
 
 
-def render_theme_analysis_tab(filtered, papers_df, trends, mapping, strategic_themes):
-    """
-    Render the Theme Analysis tab content.
-    
-    Args:
-        filtered: Filtered dataframe based on user selections
-        papers_df: Full papers dataframe
-        trends: Trends data
-        mapping: Topic mapping data
-    strategic_themes: Dictionary of strategic themes
-    """
-    # Strategic Theme Priorities - Color-coded by growth rate
-    st.markdown('<p class="sub-header">Strategic Theme Priorities</p>', unsafe_allow_html=True)
-    st.markdown("*Research themes colored by growth rate: 🟢 Green (positive growth) • 🔴 Red (negative growth)*")
-    
-    priorities = trends.get("strategic_priorities", [])
-    
-    grid = st.columns(3)
-    for i, pr in enumerate(priorities):
-        col = grid[i % 3]
-        theme = pr.get("theme", "").replace("_", " ").title()
-        growth = pr.get("growth_rate", 0)
-        papers = pr.get("total_papers", 0)
-        
-        style = get_growth_color_style_theme(growth)
-        
-        with col:
-            st.markdown(
-                f"""
+_PRIORITY_CARD_TMPL = """
                 <div class='card' style='
-                    background: {style["bg"]};
-                    border: 1px solid {style["border"]};
-                    color: {style["color"]};
+                    background: {bg};
+                    border: 1px solid {border};
+                    color: {color};
                     padding: 1rem;
                     border-radius: 10px;
                     box-shadow: 0 4px 6px -1px rgba(0,0,0,0.3);
                     transition: all 0.2s ease;
                 '>
                     <div style='display: flex; align-items: center; justify-content: space-between; margin-bottom: 0.5rem;'>
-                        <span style='font-size: 1.5rem; font-weight: bold; color: {style["icon_color"]};'>{style["icon"]}</span>
+                        <span style='font-size: 1.5rem; font-weight: bold; color: {icon_color};'>{icon}</span>
                         <span style='
                             font-size: 0.75rem;
                             font-weight: 700;
                             letter-spacing: 0.05em;
-                            color: {style["color"]};
+                            color: {color};
                             background: rgba(255, 255, 255, 0.15);
                             padding: 0.25rem 0.6rem;
                             border-radius: 5px;
-                            border: 1px solid {style["border"]};
-                        '>{style["label"]}</span>
+                            border: 1px solid {border};
+                        '>{label}</span>
                     </div>
-                    <div style='font-size: 0.95rem; font-weight: 700; margin-bottom: 0.5rem; color: {style["color"]};'>
+                    <div style='font-size: 0.95rem; font-weight: 700; margin-bottom: 0.5rem; color: {color};'>
                         {theme}
                     </div>
                     <div style='display: flex; justify-content: space-between; align-items: center; margin-top: 0.75rem; padding-top: 0.75rem; border-top: 1px solid rgba(255, 255, 255, 0.2);'>
                         <div>
-                            <div style='font-size: 1.25rem; font-weight: 800; color: {style["icon_color"]};'>{growth*100:+.1f}%</div>
-                            <div style='font-size: 0.65rem; color: {style["color"]}; opacity: 0.8;'>Growth Rate</div>
+                            <div style='font-size: 1.25rem; font-weight: 800; color: {icon_color};'>{growth_pct:+.1f}%</div>
+                            <div style='font-size: 0.65rem; color: {color}; opacity: 0.8;'>Growth Rate</div>
                         </div>
                         <div style='text-align: right;'>
-                            <div style='font-size: 1.25rem; font-weight: 800; color: {style["color"]};'>{papers:,}</div>
-                            <div style='font-size: 0.65rem; color: {style["color"]}; opacity: 0.8;'>Papers</div>
+                            <div style='font-size: 1.25rem; font-weight: 800; color: {color};'>{papers:,}</div>
+                            <div style='font-size: 0.65rem; color: {color}; opacity: 0.8;'>Papers</div>
                         </div>
                     </div>
                 </div>
-                """,
-                unsafe_allow_html=True,
-            )
+                """
+
+
+def get_growth_color_style_theme(growth_rate):
+    """Generate super dark color gradients based on growth rate for dark theme"""
+    growth_pct = growth_rate * 100
+    for lower_bound, style, label_fmt in _GROWTH_STYLE_BUCKETS:
+        if growth_pct >= lower_bound:
+            return {**style, "label": label_fmt.format(growth_pct)}
+    # NaN growth falls through every comparison, as it did the original else-branch
+    return {**_GROWTH_STYLE_BUCKETS[-1][1], "label": _GROWTH_STYLE_BUCKETS[-1][2].format(growth_pct)}
+
+
+def render_theme_analysis_tab(filtered, papers_df, trends, mapping, strategic_themes):
+    """
+    Render the Theme Analysis tab content.
+    
+    Args:
+        filtered: Filtered dataframe based on user selections
+        papers_df: Full papers dataframe
+        trends: Trends data
+        mapping: Topic mapping data
+    strategic_themes: Dictionary of strategic themes
+    """
+    # Strategic Theme Priorities - Color-coded by growth rate
+    st.markdown('<p class="sub-header">Strategic Theme Priorities</p>', unsafe_allow_html=True)
+    st.markdown("*Research themes colored by growth rate: 🟢 Green (positive growth) • 🔴 Red (negative growth)*")
+    
+    priorities = trends.get("strategic_priorities", [])
+    
+    grid = st.columns(3)
+    column_html = [[], [], []]
+    for i, pr in enumerate(priorities):
+        growth = pr.get("growth_rate", 0)
+        column_html[i % 3].append(_PRIORITY_CARD_TMPL.format_map({
+            **get_growth_color_style_theme(growth),
+            "theme": pretty_name(pr.get("theme", "")),
+            "growth_pct": growth * 100,
+            "papers": pr.get("total_papers", 0),
+        }))
+    # One markdown block per column rather than one per card
+    for col, parts in zip(grid, column_html):
+        if parts:
+            with col:
+                st.markdown("\n".join(parts), unsafe_allow_html=True)
 
     st.markdown("<div class='divider'></div>", unsafe_allow_html=True)
 
@@ -173,34 +242,32 @@ def render_theme_analysis_tab(filtered, papers_df, trends, mapping, strategic_th
     ), unsafe_allow_html=True)
     
     try:
-        timeline_fig = create_trend_timeline(filtered)
+        timeline_fig = pio.from_json(_trend_timeline_json(filtered))
         st.plotly_chart(timeline_fig, use_container_width=True, key="theme_timeline")
     except Exception as e:
         st.error(f"Could not generate timeline: {str(e)}")
 
     st.markdown("<div class='divider'></div>", unsafe_allow_html=True)
     
-    theme_order = list(strategic_themes.keys())
-    theme_names = [t.replace('_', ' ').title() for t in theme_order]
+    theme_order = tuple(strategic_themes)
+    # pretty_name is memoized, so this is a handful of dict lookups per rerun
+    theme_names = [pretty_name(t) for t in theme_order]
 
     # Theme overview summary for all papers
-    summary = (
-        papers_df.groupby("theme").agg(
-            papers=("title", "count"),
-            universities=("university", pd.Series.nunique),
-            topics=("topic_id", pd.Series.nunique),
-        )
-        if not papers_df.empty
-        else pd.DataFrame(columns=["papers", "universities", "topics"])
-    )
+    agg = precompute_dashboard_aggregates(papers_df)
+    summary = agg["theme_summary"]
     summary = summary.reindex(theme_order, fill_value=0).reset_index().rename(columns={"theme": "Theme Key"})
     summary["Theme"] = summary["Theme Key"].str.replace("_", " ").str.title()
-    summary["Growth Rate (%)"] = summary["Theme Key"].map(
-        lambda t: trends.get("theme_trends", {}).get(t, {}).get("growth_rate", 0) * 100
-    )
-    summary["Total Papers (Dataset)"] = summary["Theme Key"].map(
-        lambda t: trends.get("theme_trends", {}).get(t, {}).get("total_papers", 0)
-    )
+    # One vectorized join against the trend stats instead of per-row dict lookups
+    theme_trends = pd.DataFrame.from_dict(trends.get("theme_trends", {}), orient="index")
+    theme_trends = theme_trends.reindex(columns=["growth_rate", "total_papers"]).fillna(0).rename(columns={
+        "growth_rate": "Growth Rate (%)",
+        "total_papers": "Total Papers (Dataset)",
+    })
+    summary = summary.join(theme_trends, on="Theme Key")
+    summary[["Growth Rate (%)", "Total Papers (Dataset)"]] = summary[["Growth Rate (%)", "Total Papers (Dataset)"]].fillna(0)
+    summary["Growth Rate (%)"] *= 100
+    summary["Total Papers (Dataset)"] = summary["Total Papers (Dataset)"].astype(int)
     summary = summary[
         [
             "Theme",
@@ -220,7 +287,7 @@ def render_theme_analysis_tab(filtered, papers_df, trends, mapping, strategic_th
     st.markdown('<p class="sub-header">Research Flow Analysis</p>', unsafe_allow_html=True)
     st.markdown("*Trace how research themes flow through specific sub-themes to leading universities. Width of flow = number of papers.*")
     try:
-        sankey_fig = create_sankey_flow(filtered)
+        sankey_fig = pio.from_json(_sankey_flow_json(filtered))
         st.plotly_chart(sankey_fig, use_container_width=True)
         
         # Add interpretation
@@ -247,7 +314,8 @@ def render_theme_analysis_tab(filtered, papers_df, trends, mapping, strategic_th
 
     selected_theme_display = st.selectbox("Select Theme", theme_names, index=default_index)
     selected_theme = selected_theme_display.replace(" ", "_")
-    theme_papers = papers_df[papers_df["theme"] == selected_theme]
+    empty = papers_df.iloc[:0]
+    theme_papers, theme_with_sub = _theme_groups(papers_df).get(selected_theme, (empty, empty))
     if theme_papers.empty:
         st.warning(f"No papers found for {selected_theme_display}")
     else:
@@ -258,8 +326,8 @@ def render_theme_analysis_tab(filtered, papers_df, trends, mapping, strategic_th
         c3.metric("Sub-Topics", theme_papers["topic_id"].nunique())
         c4.metric("Universities", theme_papers["university"].nunique())
 
-        q = theme_papers.groupby("quarter").size().reset_index(name="count")
-        q["quarter"] = q["quarter"].astype(str)
+        q = theme_papers["quarter"].value_counts(sort=False)
+        q = q[q > 0].rename_axis("quarter").reset_index(name="count")
         fig = px.bar(q, x="quarter", y="count", color="count", color_continuous_scale="Blues", title=f"{selected_theme_display} - Quarterly Output")
         fig = apply_fig_theme(fig, height=340)
         st.plotly_chart(fig, use_container_width=True)
@@ -267,45 +335,38 @@ def render_theme_analysis_tab(filtered, papers_df, trends, mapping, strategic_th
         # SUB-THEME BREAKDOWN for selected parent theme
         st.markdown("<div class='divider'></div>", unsafe_allow_html=True)
         
-        theme_with_sub = theme_papers[theme_papers["sub_theme"].notna()]
         if not theme_with_sub.empty:
-            sub_theme_counts = theme_with_sub.groupby("sub_theme").agg(
+            sub_theme_counts = theme_with_sub.groupby("sub_theme", observed=True).agg(
                 papers=("title", "count"),
                 avg_confidence=("sub_theme_confidence", "mean"),
                 universities=("university", pd.Series.nunique)
-            ).sort_values("papers", ascending=False).reset_index()
+            ).nlargest(10, "papers").reset_index()
             sub_theme_counts["sub_theme"] = sub_theme_counts["sub_theme"].str.replace("_", " ").str.title()
             sub_theme_counts["avg_confidence"] = (sub_theme_counts["avg_confidence"] * 100).round(1)
             sub_theme_counts.columns = ["Sub-Theme", "Papers", "Avg Confidence (%)", "Universities"]
             
             
             # Sub-theme distribution chart
-            top_10_sub = sub_theme_counts.head(10).sort_values("Papers", ascending=True)  # Sort ascending for correct order
-            fig_sub = px.bar(
-                top_10_sub,
-                x="Papers",
-                y="Sub-Theme",
-                orientation="h",
-                color="Avg Confidence (%)",
-                color_continuous_scale="Blues",
-                title=f"Top 10 Sub-Themes in {selected_theme_display}"
-            )
-            fig_sub = apply_fig_theme(fig_sub, height=340)
+            top_10_sub = sub_theme_counts.sort_values("Papers", ascending=True)  # Sort ascending for correct order
+            fig_sub = pio.from_json(_theme_sub_bar_json(
+                tuple(top_10_sub[["Sub-Theme", "Papers", "Avg Confidence (%)"]].itertuples(index=False, name=None)),
+                selected_theme_display,
+            ))
             st.plotly_chart(fig_sub, use_container_width=True)
         else:
             st.info(f"No sub-theme data available for {selected_theme_display}")
 
         st.markdown("<div class='divider'></div>", unsafe_allow_html=True)
 
-        uc = theme_papers["university"].value_counts().head(10)
+        uc = theme_papers["university"].value_counts()
+        uc = uc[uc > 0].head(10)
         uc_sorted = uc.sort_values(ascending=True)  # Sort ascending for correct order
-        fig = px.bar(x=uc_sorted.values, y=uc_sorted.index, orientation="h", color=uc_sorted.values, color_continuous_scale="Blues", title=f"Top 10 Universities in {selected_theme_display}")
-        fig = apply_fig_theme(fig, height=340)
+        fig = pio.from_json(_theme_university_bar_json(tuple(uc_sorted.items()), selected_theme_display))
         st.plotly_chart(fig, use_container_width=True)
 
-        adj = find_adjacent_themes(papers_df, selected_theme, mapping)
+        adj = find_adjacent_themes(papers_df, selected_theme, mapping, k=5)
         if adj:
-            adj_df = pd.DataFrame({"Theme": [t.replace("_", " ").title() for t in list(adj.keys())[:5]], "Connections": list(adj.values())[:5]})
+            adj_df = pd.DataFrame([(pretty_name(t), n) for t, n in adj], columns=["Theme", "Connections"])
             adj_df = adj_df.sort_values("Connections", ascending=True)  # Sort ascending for correct order
             fig_adj = px.bar(adj_df, x="Connections", y="Theme", orientation="h", color="Connections", color_continuous_scale="Blues", title=f"Top Adjacent Themes to {selected_theme_display}")
             fig_adj = apply_fig_theme(fig_adj, height=300)
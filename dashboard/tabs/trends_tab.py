@@ -2,47 +2,118 @@
 Trends tab - Research output trends, lifecycle analysis, heatmap, and strategic recommendations.
 """
 import streamlit as st
-import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
 
 from dashboard.utils.visualizations import create_growth_heatmap
 from dashboard.utils.styling import apply_fig_theme
+from dashboard.utils.caching import FRAME_HASH_FUNCS
+from dashboard.utils.data_loader import normalized_name_map, precompute_dashboard_aggregates
 from config.themes import STRATEGIC_THEMES
 
 
-def render_trends_tab(filtered, papers_df, trends):
+_THEME_NAMES = tuple(t.replace("_", " ").title() for t in STRATEGIC_THEMES.keys())
+
+
+@st.cache_data(show_spinner=False, hash_funcs=FRAME_HASH_FUNCS)
+def _theme_quarter_pivot(papers_df):
+    """Quarter x theme paper counts over the full dataset, computed once per data version."""
+    return papers_df.groupby(["quarter", "theme"], observed=True).size().unstack(fill_value=0).sort_index()
+
+
+@st.cache_data(show_spinner=False, hash_funcs=FRAME_HASH_FUNCS)
+def _sub_theme_quarter_counts(papers_df):
+    """Paper counts per (sub_theme, quarter) pair that has any papers."""
+    return papers_df.groupby(["sub_theme", "quarter"], observed=True).size()
+
+
+@st.cache_data(show_spinner=False, max_entries=8, hash_funcs=FRAME_HASH_FUNCS)
+def _growth_heatmap_json(filtered):
+    """Plotly JSON for the sub-theme activity heatmap, cached per filtered view."""
+    return create_growth_heatmap(filtered).to_json()
+
+
+@st.cache_data(show_spinner=False, hash_funcs=FRAME_HASH_FUNCS)
+def _recommendations(papers_df, trends):
     """
-    Render the Trends tab content.
-    
-    Args:
-        filtered: Filtered dataframe based on user selections
-        papers_df: Full papers dataframe
-        trends: Trends data
+    Strategic recommendation lists for the Trends tab; none depend on the tab's widgets.
+
+    Returns:
+        Tuple of (high_growth, opportunities, collab_potential) where high_growth and
+        collab_potential are (rank, sub_theme, value) tuples and opportunities are dicts
     """
-    # ========== 1. RESEARCH OUTPUT TRENDS (SELECTED THEMES) ==========
+    # Calculate growth rates and gaps
+    years = papers_df['date'].dt.year
+    recent_year = years.max()
+    prev_year = recent_year - 1
+
+    # Sub-theme analysis: one groupby over both years, one column per year.
+    # groupby drops missing sub-themes, so the lists below need no notna check.
+    in_window = years.isin([prev_year, recent_year]).to_numpy()
+    growth_analysis = (
+        papers_df.loc[in_window]
+        .groupby(['sub_theme', years[in_window]], observed=True).size()
+        .unstack(fill_value=0)
+        .reindex(columns=[recent_year, prev_year], fill_value=0)
+    )
+    growth_analysis.columns = ['recent', 'previous']
+    growth_analysis['growth_rate'] = ((growth_analysis['recent'] - growth_analysis['previous']) / 
+                                       (growth_analysis['previous'] + 1) * 100)
+
+    high_growth = [
+        (idx, subtheme, row['growth_rate'])
+        for idx, (subtheme, row) in enumerate(growth_analysis.nlargest(5, 'growth_rate').iterrows(), 1)
+        if row['growth_rate'] > 0
+    ]
+
+    # High strategic value but low volume
+    priorities = trends.get("strategic_priorities", [])
+    priority_themes = [p['theme'] for p in priorities[:5]]
+
+    opportunities = []
+    for theme in priority_themes:
+        theme_papers = papers_df[papers_df['theme'] == theme]
+        if len(theme_papers) < 2000:  # Under-researched
+            sub_counts = theme_papers['sub_theme'].value_counts()
+            sub_counts = sub_counts[sub_counts > 0]
+            if len(sub_counts) > 0:
+                opportunities.append({
+                    'theme': theme,
+                    'sub_theme': sub_counts.index[0],
+                    'count': sub_counts.iloc[0],
+                    'potential': 2000 - len(theme_papers)
+                })
+
+    # Find sub-themes with multiple universities
+    collab = papers_df.groupby('sub_theme', observed=True).agg({
+        'university': 'nunique',
+        'title': 'count'
+    }).rename(columns={'university': 'unis', 'title': 'papers'})
+    collab = collab[collab['unis'] >= 3].nlargest(5, 'unis')
+    collab_potential = [
+        (idx, subtheme, int(row['unis']))
+        for idx, (subtheme, row) in enumerate(collab.iterrows(), 1)
+    ]
+
+    return high_growth, opportunities, collab_potential
+
+
+@st.fragment
+def _theme_trends_section(papers_df):
+    """Theme comparison chart; its multiselect reruns only this fragment."""
     st.markdown('<p class="sub-header">Research Output Trends</p>', unsafe_allow_html=True)
     st.markdown("*Compare research output trajectories across themes over time.*")
     
-    names = [t.replace("_", " ").title() for t in STRATEGIC_THEMES.keys()]
-    picks = st.multiselect("Select Themes to Compare", names, default=names[:3])
+    picks = st.multiselect("Select Themes to Compare", _THEME_NAMES, default=_THEME_NAMES[:3])
     
     if picks:
         # Convert selected names back to match original data format
-        raw = []
-        for pick in picks:
-            pick_normalized = pick.replace(" ", "_").lower()
-            # Find matching theme in actual data
-            for theme in papers_df["theme"].unique():
-                if theme.lower() == pick_normalized:
-                    raw.append(theme)
-                    break
+        theme_map = normalized_name_map(papers_df["theme"])
+        raw = [theme_map[key] for key in (pick.replace(" ", "_").lower() for pick in picks) if key in theme_map]
         
-        f = papers_df[papers_df["theme"].isin(raw)]
-        quarters = sorted(papers_df["quarter"].unique())
-        base = pd.MultiIndex.from_product([quarters, raw], names=["quarter", "theme"]) 
-        qt = f.groupby(["quarter", "theme"]).size().reindex(base, fill_value=0).reset_index(name="count")
-        qt["quarter"], qt["theme"] = qt["quarter"].astype(str), qt["theme"].str.replace("_", " ").str.title()
+        qt = _theme_quarter_pivot(papers_df)[raw].stack().reset_index(name="count")
+        qt["theme"] = qt["theme"].str.replace("_", " ").str.title()
         
         fig = px.line(
             qt, 
@@ -58,18 +129,20 @@ def render_trends_tab(filtered, papers_df, trends):
         st.plotly_chart(fig, use_container_width=True)
     else:
         st.info("Please select at least one theme to view trends.")
-    
-    st.markdown("<div class='divider'></div>", unsafe_allow_html=True)
-    
-    # ========== 2. SUB-THEME LIFECYCLE ANALYSIS ==========
+
+
+@st.fragment
+def _lifecycle_section(papers_df):
+    """Sub-theme lifecycle chart; its multiselect reruns only this fragment."""
     st.markdown('<p class="sub-header">Sub-Theme Lifecycle Analysis</p>', unsafe_allow_html=True)
     st.markdown("*Track the rise and fall of specific sub-themes over time. Select sub-themes to analyze their trajectories.*")
     
     # Get all sub-themes for selection
-    all_subthemes = sorted([s for s in papers_df['sub_theme'].dropna().unique() if s])
+    agg = precompute_dashboard_aggregates(papers_df)
+    all_subthemes = agg["sub_themes"]
     
     # Default to top 5 most active sub-themes
-    subtheme_counts = papers_df['sub_theme'].value_counts()
+    subtheme_counts = agg["sub_theme_counts"]
     default_subthemes = [s.replace('_', ' ') for s in subtheme_counts.head(5).index]
     
     selected_subthemes = st.multiselect(
@@ -81,20 +154,18 @@ def render_trends_tab(filtered, papers_df, trends):
     
     if selected_subthemes:
         # Convert back to match original data format (preserve exact casing from data)
-        raw_subthemes = []
-        for selected in selected_subthemes:
-            selected_normalized = selected.replace(' ', '_').lower()
-            # Find matching sub-theme in actual data
-            for subtheme in papers_df['sub_theme'].dropna().unique():
-                if subtheme.lower() == selected_normalized:
-                    raw_subthemes.append(subtheme)
-                    break
+        subtheme_map = normalized_name_map(papers_df['sub_theme'])
+        raw_subthemes = [
+            subtheme_map[key]
+            for key in (selected.replace(' ', '_').lower() for selected in selected_subthemes)
+            if key in subtheme_map
+        ]
         
-        # Create lifecycle data
-        lifecycle_df = papers_df[papers_df['sub_theme'].isin(raw_subthemes)].copy()
-        lifecycle_df['year_quarter'] = lifecycle_df['date'].dt.to_period('Q').astype(str)
-        
-        lifecycle_data = lifecycle_df.groupby(['sub_theme', 'year_quarter']).size().reset_index(name='count')
+        # Create lifecycle data from the cached sub-theme x quarter counts
+        sub_quarter_counts = _sub_theme_quarter_counts(papers_df)
+        lifecycle_data = sub_quarter_counts[
+            sub_quarter_counts.index.get_level_values('sub_theme').isin(raw_subthemes)
+        ].rename_axis(['sub_theme', 'year_quarter']).reset_index(name='count')
         lifecycle_data['sub_theme'] = lifecycle_data['sub_theme'].str.replace('_', ' ').str.title()
         
         # Create line chart
@@ -131,6 +202,24 @@ def render_trends_tab(filtered, papers_df, trends):
         )
     else:
         st.info("Please select at least one sub-theme to view its lifecycle trajectory.")
+
+
+def render_trends_tab(filtered, papers_df, trends):
+    """
+    Render the Trends tab content.
+    
+    Args:
+        filtered: Filtered dataframe based on user selections
+        papers_df: Full papers dataframe
+        trends: Trends data
+    """
+    # ========== 1. RESEARCH OUTPUT TRENDS (SELECTED THEMES) ==========
+    _theme_trends_section(papers_df)
+    
+    st.markdown("<div class='divider'></div>", unsafe_allow_html=True)
+    
+    # ========== 2. SUB-THEME LIFECYCLE ANALYSIS ==========
+    _lifecycle_section(papers_df)
     
     st.markdown("<div class='divider'></div>", unsafe_allow_html=True)
     
@@ -138,7 +227,7 @@ def render_trends_tab(filtered, papers_df, trends):
     st.markdown('<p class="sub-header">Sub-Theme Activity Heatmap</p>', unsafe_allow_html=True)
     st.markdown("*Track research activity intensity across sub-themes over time. Warmer colors indicate higher activity.*")
     try:
-        heatmap_fig = create_growth_heatmap(filtered)
+        heatmap_fig = pio.from_json(_growth_heatmap_json(filtered))
         st.plotly_chart(heatmap_fig, use_container_width=True)
     except Exception as e:
         st.warning(f"Heatmap could not be generated: {e}")
@@ -148,84 +237,41 @@ def render_trends_tab(filtered, papers_df, trends):
     # ========== 4. STRATEGIC RESEARCH RECOMMENDATIONS ==========
     st.markdown('<p class="sub-header">Strategic Research Recommendations</p>', unsafe_allow_html=True)
     
-    # Calculate growth rates and gaps
-    recent_year = papers_df['date'].dt.year.max()
-    prev_year = recent_year - 1
-    
-    recent_df = papers_df[papers_df['date'].dt.year == recent_year]
-    prev_df = papers_df[papers_df['date'].dt.year == prev_year]
-    
-    # Sub-theme analysis
-    recent_subthemes = recent_df.groupby('sub_theme').size()
-    prev_subthemes = prev_df.groupby('sub_theme').size()
-    
-    growth_analysis = pd.DataFrame({
-        'recent': recent_subthemes,
-        'previous': prev_subthemes
-    }).fillna(0)
-    growth_analysis['growth_rate'] = ((growth_analysis['recent'] - growth_analysis['previous']) / 
-                                       (growth_analysis['previous'] + 1) * 100)
-    growth_analysis['total'] = growth_analysis['recent'] + growth_analysis['previous']
-    
+    high_growth, opportunities, collab_potential = _recommendations(papers_df, trends)
+
     # Recommendations
     rec_cols = st.columns(3)
     
+    # One markdown block per column rather than one per card
     with rec_cols[0]:
         st.markdown("**High Growth Areas**")
-        high_growth = growth_analysis.nlargest(5, 'growth_rate')
-        for idx, (subtheme, row) in enumerate(high_growth.iterrows(), 1):
-            if pd.notna(subtheme) and row['growth_rate'] > 0:
-                st.markdown(
-                    f"<div class='card' style='background:#064e3b; border: 1px solid #059669; padding:0.5em;'>"
-                    f"<div style='font-size:0.9em; font-weight:500; color:#d1fae5;'>{idx}. {subtheme}</div>"
-                    f"<div style='font-size:0.8em; color:#6ee7b7;'>↗ {row['growth_rate']:.0f}% growth</div>"
-                    f"</div>",
-                    unsafe_allow_html=True
-                )
+        if high_growth:
+            st.markdown("".join(
+                f"<div class='card' style='background:#064e3b; border: 1px solid #059669; padding:0.5em;'>"
+                f"<div style='font-size:0.9em; font-weight:500; color:#d1fae5;'>{idx}. {subtheme}</div>"
+                f"<div style='font-size:0.8em; color:#6ee7b7;'>↗ {growth_rate:.0f}% growth</div>"
+                f"</div>"
+                for idx, subtheme, growth_rate in high_growth
+            ), unsafe_allow_html=True)
     
     with rec_cols[1]:
         st.markdown("**Investment Opportunities**")
-        # High strategic value but low volume
-        priorities = trends.get("strategic_priorities", [])
-        priority_themes = [p['theme'] for p in priorities[:5]]
-        
-        opportunities = []
-        for theme in priority_themes:
-            theme_papers = papers_df[papers_df['theme'] == theme]
-            if len(theme_papers) < 2000:  # Under-researched
-                sub_counts = theme_papers['sub_theme'].value_counts()
-                if len(sub_counts) > 0:
-                    opportunities.append({
-                        'theme': theme,
-                        'sub_theme': sub_counts.index[0],
-                        'count': sub_counts.iloc[0],
-                        'potential': 2000 - len(theme_papers)
-                    })
-        
-        for idx, opp in enumerate(opportunities[:5], 1):
-            st.markdown(
+        if opportunities:
+            st.markdown("".join(
                 f"<div class='card' style='background:#1e3a8a; border: 1px solid #3b82f6; padding:0.5em;'>"
                 f"<div style='font-size:0.9em; font-weight:500; color:#bfdbfe;'>{idx}. {opp['sub_theme']}</div>"
                 f"<div style='font-size:0.8em; color:#93c5fd;'>Gap: {opp['potential']} papers</div>"
-                f"</div>",
-                unsafe_allow_html=True
-            )
+                f"</div>"
+                for idx, opp in enumerate(opportunities[:5], 1)
+            ), unsafe_allow_html=True)
     
     with rec_cols[2]:
         st.markdown("**Collaboration Focus**")
-        # Find sub-themes with multiple universities
-        collab_potential = papers_df.groupby('sub_theme').agg({
-            'university': 'nunique',
-            'title': 'count'
-        }).rename(columns={'university': 'unis', 'title': 'papers'})
-        collab_potential = collab_potential[collab_potential['unis'] >= 3].nlargest(5, 'unis')
-        
-        for idx, (subtheme, row) in enumerate(collab_potential.iterrows(), 1):
-            if pd.notna(subtheme):
-                st.markdown(
-                    f"<div class='card' style='background:#78350f; border: 1px solid #f59e0b; padding:0.5em;'>"
-                    f"<div style='font-size:0.9em; font-weight:500; color:#fef3c7;'>{idx}. {subtheme}</div>"
-                    f"<div style='font-size:0.8em; color:#fcd34d;'>{int(row['unis'])} universities</div>"
-                    f"</div>",
-                    unsafe_allow_html=True
-                )
+        if collab_potential:
+            st.markdown("".join(
+                f"<div class='card' style='background:#78350f; border: 1px solid #f59e0b; padding:0.5em;'>"
+                f"<div style='font-size:0.9em; font-weight:500; color:#fef3c7;'>{idx}. {subtheme}</div>"
+                f"<div style='font-size:0.8em; color:#fcd34d;'>{unis} universities</div>"
+                f"</div>"
+                for idx, subtheme, unis in collab_potential
+            ), unsafe_allow_html=True)
@@ -2,36 +2,56 @@
 Universities tab - University rankings, deep dive, and comparison.
 """
 import streamlit as st
+import pandas as pd
 import plotly.express as px
+import plotly.io as pio
 
 from dashboard.utils.visualizations import create_university_radar
 from dashboard.utils.styling import apply_fig_theme
+from dashboard.utils.data_loader import precompute_dashboard_aggregates
+from dashboard.utils.caching import FRAME_HASH_FUNCS
 
 
-def render_universities_tab(filtered, papers_df):
-    """
-    Render the Universities tab content.
-    
-    Args:
-        filtered: Filtered dataframe based on user selections
-        papers_df: Full papers dataframe
-    """
-    st.markdown('<p class="sub-header">Overall Research Output Rankings</p>', unsafe_allow_html=True)
-    uc = papers_df["university"].value_counts()
-    uc_top15 = uc.head(15).sort_values(ascending=True)  # Sort ascending for correct order
-    fig = px.bar(x=uc_top15.values, y=uc_top15.index, orientation="h", color=uc_top15.values, color_continuous_scale="Blues", title=" ", labels={"x": "Number of Papers", "y": "University"})
-    fig = apply_fig_theme(fig, height=380)
-    st.plotly_chart(fig, use_container_width=True)
+@st.cache_data(show_spinner=False, hash_funcs=FRAME_HASH_FUNCS)
+def _uni_profiles(papers_df):
+    """Per-university deep-dive aggregates for every university, from one groupby pass each."""
+    grp = papers_df.groupby("university", observed=True)
+    return {
+        "counts": grp.size(),
+        "themes": grp["theme"].nunique(),
+        "topics": grp["topic_id"].nunique(),
+        "theme_dist": papers_df.groupby(["university", "theme"], observed=True).size().unstack(fill_value=0),
+        "quarter_ts": papers_df.groupby(["university", "quarter"], observed=True).size().unstack(fill_value=0),
+    }
+
+
+@st.cache_data(show_spinner=False, hash_funcs=FRAME_HASH_FUNCS)
+def _university_radar_json(filtered, selected_unis):
+    """Plotly JSON for the sub-theme radar (None if it cannot be drawn), cached per view and selection."""
+    radar_fig = create_university_radar(filtered, list(selected_unis))
+    return radar_fig.to_json() if radar_fig else None
+
+
+def _profile_row(table, university):
+    """One university's row of a university x label count table (empty if it has no papers)."""
+    if university in table.index:
+        return table.loc[university]
+    return pd.Series(dtype="int64")
+
 
+@st.fragment
+def _deep_dive_section(papers_df, universities):
+    """Single-university metrics and charts; the selectbox reruns only this fragment."""
     st.markdown('<p class="sub-header">University Deep Dive</p>', unsafe_allow_html=True)
-    sel_uni = st.selectbox("Select University", sorted(papers_df["university"].unique()))
-    uni_p = papers_df[papers_df["university"] == sel_uni]
+    sel_uni = st.selectbox("Select University", universities)
+    profiles = _uni_profiles(papers_df)
 
     c1, c2, c3, c4 = st.columns(4)
-    c1.metric("Total Papers", f"{len(uni_p):,}")
-    c2.metric("Themes", uni_p["theme"].nunique())
-    c3.metric("Topics", uni_p["topic_id"].nunique())
-    qg = uni_p.groupby("quarter").size()
+    c1.metric("Total Papers", f"{profiles['counts'].get(sel_uni, 0):,}")
+    c2.metric("Themes", profiles["themes"].get(sel_uni, 0))
+    c3.metric("Topics", profiles["topics"].get(sel_uni, 0))
+    qg = _profile_row(profiles["quarter_ts"], sel_uni)
+    qg = qg[qg > 0]
     if len(qg) >= 2:
         growth = (qg.iloc[-1] - qg.iloc[-2]) / max(1, qg.iloc[-2]) * 100
         c4.metric("Recent Growth", f"{growth:+.0f}%")
@@ -41,24 +61,23 @@ def render_universities_tab(filtered, papers_df):
     colA, colB = st.columns(2)
     with colA:
         st.markdown('<p class="sub-header">Research Themes</p>', unsafe_allow_html=True)
-        tdist = uni_p["theme"].value_counts()
+        tdist = _profile_row(profiles["theme_dist"], sel_uni)
+        tdist = tdist[tdist > 0].sort_values(ascending=False)
         fig = px.pie(values=tdist.values, names=[t.replace('_',' ').title() for t in tdist.index], title=f"{sel_uni} - Theme Distribution")
         fig = apply_fig_theme(fig, height=350)
         st.plotly_chart(fig, use_container_width=True)
     with colB:
         st.markdown('<p class="sub-header">Output Over Time</p>', unsafe_allow_html=True)
-        q = uni_p.groupby("quarter").size().reset_index(name="count"); q["quarter"] = q["quarter"].astype(str)
+        q = qg.rename_axis("quarter").reset_index(name="count")
         fig = px.line(q, x="quarter", y="count", markers=True, title=f"{sel_uni} - Quarterly Output", labels={"quarter": "Quarter", "count": "Number of Papers"})
         fig = apply_fig_theme(fig, height=350)
         st.plotly_chart(fig, use_container_width=True)
-    
-    # ========== UNIVERSITY COMPARISON RADAR ==========
-    st.markdown("<div class='divider'></div>", unsafe_allow_html=True)
-    st.markdown('<p class="sub-header">University Research Profile Comparison</p>', unsafe_allow_html=True)
-    st.markdown("*Compare research focus across sub-themes for selected universities*")
-    
+
+
+@st.fragment
+def _comparison_section(filtered, all_unis):
+    """Sub-theme radar for the chosen universities; the multiselect reruns only this fragment."""
     # Multi-select for universities
-    all_unis = sorted(papers_df["university"].unique())
     default_unis = all_unis[:min(3, len(all_unis))]  # Default to top 3
     selected_unis = st.multiselect(
         "Select Universities to Compare (2-5)",
@@ -69,9 +88,9 @@ def render_universities_tab(filtered, papers_df):
     
     if len(selected_unis) >= 2:
         try:
-            radar_fig = create_university_radar(filtered, selected_unis)
-            if radar_fig:
-                st.plotly_chart(radar_fig, use_container_width=True)
+            radar_json = _university_radar_json(filtered, tuple(selected_unis))
+            if radar_json:
+                st.plotly_chart(pio.from_json(radar_json), use_container_width=True)
                 st.markdown(
                     '<div style="padding: 1rem; background: #1e3a5f; border-left: 4px solid #3b82f6; border-radius: 0.5rem; color: #f1f5f9;">'
                     '<strong style="color: #60a5fa;">Strategic Insight:</strong> Larger area = stronger focus. Compare shapes to identify complementary strengths for potential collaborations.'
@@ -84,3 +103,29 @@ def render_universities_tab(filtered, papers_df):
             st.warning(f"Radar chart could not be generated: {e}")
     else:
         st.info("Please select at least 2 universities to compare their research profiles.")
+
+
+def render_universities_tab(filtered, papers_df):
+    """
+    Render the Universities tab content.
+    
+    Args:
+        filtered: Filtered dataframe based on user selections
+        papers_df: Full papers dataframe
+    """
+    st.markdown('<p class="sub-header">Overall Research Output Rankings</p>', unsafe_allow_html=True)
+    agg = precompute_dashboard_aggregates(papers_df)
+    uc = agg["university_counts"]
+    uc_top15 = uc.head(15).sort_values(ascending=True)  # Sort ascending for correct order
+    fig = px.bar(x=uc_top15.values, y=uc_top15.index, orientation="h", color=uc_top15.values, color_continuous_scale="Blues", title=" ", labels={"x": "Number of Papers", "y": "University"})
+    fig = apply_fig_theme(fig, height=380)
+    st.plotly_chart(fig, use_container_width=True)
+
+    _deep_dive_section(papers_df, agg["universities"])
+
+    # ========== UNIVERSITY COMPARISON RADAR ==========
+    st.markdown("<div class='divider'></div>", unsafe_allow_html=True)
+    st.markdown('<p class="sub-header">University Research Profile Comparison</p>', unsafe_allow_html=True)
+    st.markdown("*Compare research focus across sub-themes for selected universities*")
+    
+    _comparison_section(filtered, agg["universities"])
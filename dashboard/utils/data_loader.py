@@ -1,6 +1,8 @@
 """Data loading and preprocessing utilities."""
 import os
 import json
+from datetime import date
+import numpy as np
 import pandas as pd
 import streamlit as st
 import sys
@@ -8,9 +10,19 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 from config.settings import (
     PROCESSED_PAPERS_CSV,
+    PROCESSED_PAPERS_PARQUET,
     TREND_ANALYSIS_PATH,
     TOPIC_MAPPING_PATH,
 )
+from config.themes import STRATEGIC_THEMES
+from dashboard.utils.caching import FRAME_HASH_FUNCS
+
+
+_NS_PER_DAY = 86_400 * 10**9
+_NAT_NS = np.iinfo(np.int64).min
+
+# Topic mapping fields copied onto each paper, with the value used when a topic has none
+_TOPIC_FIELDS = {"theme": "Other", "confidence": 0, "sub_theme": None, "sub_theme_confidence": 0}
 
 
 def _load_json(path: str):
@@ -22,46 +34,129 @@ def _load_json(path: str):
             return json.loads(f.read())
 
 
-@st.cache_data
+def _source_signature():
+    """(path, mtime_ns, size) for each input file, so rewriting the data invalidates the disk cache."""
+    signature = []
+    for path in (PROCESSED_PAPERS_CSV, PROCESSED_PAPERS_PARQUET, TREND_ANALYSIS_PATH, TOPIC_MAPPING_PATH):
+        try:
+            stat = os.stat(path)
+            signature.append((str(path), stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            signature.append((str(path), None, None))
+    return tuple(signature)
+
+
+def _papers_source():
+    """
+    Path of the processed papers file to read.
+
+    The Parquet copy written by the topic analysis step is preferred; the CSV is used
+    when there is no Parquet file or the CSV has been rewritten since (e.g. by the
+    preprocessor alone), so a stale Parquet copy never shadows newer data.
+    """
+    try:
+        parquet_mtime = os.stat(PROCESSED_PAPERS_PARQUET).st_mtime_ns
+    except OSError:
+        return PROCESSED_PAPERS_CSV
+    try:
+        csv_mtime = os.stat(PROCESSED_PAPERS_CSV).st_mtime_ns
+    except OSError:
+        return PROCESSED_PAPERS_PARQUET
+    return PROCESSED_PAPERS_PARQUET if parquet_mtime >= csv_mtime else PROCESSED_PAPERS_CSV
+
+
 def load_data():
     """Load and preprocess all dashboard data."""
-    if not os.path.exists(PROCESSED_PAPERS_CSV):
-        raise FileNotFoundError(PROCESSED_PAPERS_CSV)
-    df = pd.read_csv(PROCESSED_PAPERS_CSV)
+    return _load_scored_data(_source_signature(), date.today().isoformat())
+
+
+@st.cache_data(max_entries=1, show_spinner=False)
+def _load_scored_data(source_signature, as_of):
+    """
+    Add the day-dependent scores to the disk-cached papers frame.
+
+    Recency scores are relative to today, so this small in-memory step is keyed on the day;
+    the parsed frame underneath stays cached on disk per data version only.
+    """
+    df, trends, mapping = _load_data_cached(source_signature)
+    _add_day_scores(df)
+    return df, trends, mapping
+
+
+def _add_day_scores(df):
+    """Insert recency_score and relevance_score (both depend on today's date) after citation_score."""
+    # Whole days since publication as int64 nanosecond arithmetic; undated papers count as new
+    date_ns = df["date"].to_numpy(dtype="datetime64[ns]").view("i8")
+    days_old = np.where(date_ns == _NAT_NS, 0, (pd.Timestamp.now().value - date_ns) // _NS_PER_DAY)
+    recency = np.clip(100 - (days_old / 730) * 100, 0, 100)
+    # Weighted blend accumulated in one float64 buffer instead of a chain of pandas temporaries
+    relevance = df["confidence"].fillna(0).to_numpy(dtype=np.float64) * 0.40
+    relevance += df["citation_score"].fillna(0).to_numpy(dtype=np.float64) * 0.30
+    relevance += recency * 0.30
+    position = df.columns.get_loc("citation_score") + 1
+    df.insert(position, "recency_score", recency)
+    df.insert(position + 1, "relevance_score", np.clip(relevance, 0, 100, out=relevance))
+
+
+@st.cache_data(persist="disk", max_entries=2, show_spinner="Loading research data…")
+def _load_data_cached(source_signature):
+    """Disk-persisted body of load_data, keyed on the data files only; the argument only keys the cache."""
+    papers_path = _papers_source()
+    if not os.path.exists(papers_path):
+        raise FileNotFoundError(papers_path)
+    if papers_path == PROCESSED_PAPERS_PARQUET:
+        df = pd.read_parquet(papers_path)
+    else:
+        # Arrow's multi-threaded CSV reader; pyarrow is already required by Streamlit
+        df = pd.read_csv(papers_path, engine="pyarrow")
     if "date" in df.columns:
         df["date"] = pd.to_datetime(df["date"])
     # Normalize university names to avoid mismatches (strip/condense spaces)
     if "university" in df.columns:
-        df["university"] = (
-            df["university"].fillna("Unknown").astype(str).str.strip().str.replace(r"\s+", " ", regex=True)
-        )
+        # Clean each distinct raw name once, then map rows back through the category codes
+        universities = df["university"].fillna("Unknown").astype(str).astype("category")
+        names = universities.cat.categories.str.strip().str.replace(r"\s+", " ", regex=True)
+        df["university"] = names.take(universities.cat.codes.to_numpy()).to_numpy()
 
     trends = _load_json(TREND_ANALYSIS_PATH)
     mapping = _load_json(TOPIC_MAPPING_PATH)
 
+    # topic_id is low-cardinality: store it as a categorical, build one row of mapping
+    # fields per distinct topic, and broadcast that table to papers through the codes
+    df["topic_id"] = df["topic_id"].astype("category")
+    topic_keys = df["topic_id"].cat.categories.astype(str)
+    topic_info = pd.DataFrame.from_records(
+        [[mapping.get(t, {}).get(field, default) for field, default in _TOPIC_FIELDS.items()] for t in topic_keys]
+        # Trailing defaults row is picked up by code -1 (missing topic_id)
+        + [list(_TOPIC_FIELDS.values())],
+        columns=list(_TOPIC_FIELDS),
+    )
+    topic_info["cyber_score"] = [
+        mapping.get(t, {}).get("all_scores", {}).get("Cybersecurity", 0) for t in topic_keys
+    ] + [0]
+    topic_codes = df["topic_id"].cat.codes.to_numpy()
+    paper_topics = topic_info[list(_TOPIC_FIELDS)].take(topic_codes)
+
     # PRESERVE original theme from CSV (assigned during collection)
     # BERTopic mapping is only used for confidence scores and topic details
     # If CSV doesn't have theme column, fall back to BERTopic mapping
     if "theme" not in df.columns:
-        df["theme"] = df["topic_id"].astype(str).map(lambda t: mapping.get(str(t), {}).get("theme", "Other"))
+        df["theme"] = paper_topics["theme"].to_numpy()
     
-    df["confidence"] = df["topic_id"].astype(str).map(lambda t: mapping.get(str(t), {}).get("confidence", 0))
+    df["confidence"] = paper_topics["confidence"].to_numpy()
     
     # ADD SUB-THEME MAPPING (from hierarchical structure)
-    df["sub_theme"] = df["topic_id"].astype(str).map(lambda t: mapping.get(str(t), {}).get("sub_theme", None))
-    df["sub_theme_confidence"] = df["topic_id"].astype(str).map(lambda t: mapping.get(str(t), {}).get("sub_theme_confidence", 0))
+    df["sub_theme"] = paper_topics["sub_theme"].to_numpy()
+    df["sub_theme_confidence"] = paper_topics["sub_theme_confidence"].to_numpy()
 
     # Reinstate Cybersecurity assignments when similarity score is strong but original mapping fell back to another theme.
-    cyber_topics = {
-        str(tid): data.get("all_scores", {}).get("Cybersecurity", 0)
-        for tid, data in mapping.items()
-        if data.get("all_scores", {}).get("Cybersecurity", 0) >= 0.12 and data.get("theme") != "Cybersecurity"
-    }
-    if cyber_topics:
-        mask = df["topic_id"].astype(str).isin(cyber_topics.keys())
-        if mask.any():
-            df.loc[mask, "theme"] = "Cybersecurity"
-            df.loc[mask, "confidence"] = df.loc[mask, "topic_id"].astype(str).map(cyber_topics)
+    # Decided per topic, so papers are only scanned when at least one topic qualifies.
+    cyber_score = topic_info["cyber_score"].to_numpy()
+    reinstate = (cyber_score >= 0.12) & (topic_info["theme"].to_numpy() != "Cybersecurity")
+    if reinstate.any():
+        mask = reinstate[topic_codes]
+        df.loc[mask, "theme"] = "Cybersecurity"
+        df.loc[mask, "confidence"] = cyber_score[topic_codes[mask]]
     if df["confidence"].max() <= 1:
         df["confidence"] = (df["confidence"] * 100).round(0)
 
@@ -71,13 +166,70 @@ def load_data():
         df["citation_score"] = (df["citations"] / max_cit) * 100
     else:
         df["citation_score"] = 0
-    days_old = (pd.Timestamp.now() - pd.to_datetime(df["date"]).fillna(pd.Timestamp.now())).dt.days
-    df["recency_score"] = (100 - (days_old / 730) * 100).clip(lower=0, upper=100)
-    df["relevance_score"] = (
-        df["confidence"].fillna(0) * 0.40
-        + df["citation_score"].fillna(0) * 0.30
-        + df["recency_score"].fillna(0) * 0.30
-    ).clip(0, 100)
 
     df["quarter"] = df["date"].dt.to_period("Q")
+
+    # Store low-cardinality labels as categoricals so groupby/value_counts work on integer codes.
+    # Categories are sorted so grouped output keeps the same (alphabetical) order as before.
+    theme_categories = sorted(set(STRATEGIC_THEMES) | set(df["theme"].dropna().unique()))
+    df["theme"] = df["theme"].astype(pd.CategoricalDtype(categories=theme_categories))
+    df["sub_theme"] = df["sub_theme"].astype("category")
+    if "university" in df.columns:
+        df["university"] = df["university"].astype("category")
+    # Quarter labels are stored as strings ("2024Q1") so charts can use them without a per-render cast;
+    # renaming the Period categories keeps them in chronological order
+    df["quarter"] = df["quarter"].astype("category").cat.rename_categories(str)
     return df, trends, mapping
+
+
+@st.cache_data(show_spinner=False, hash_funcs=FRAME_HASH_FUNCS)
+def precompute_dashboard_aggregates(papers_df):
+    """
+    Full-dataset aggregates shared by the Overview, Theme Analysis, Trends and Universities tabs.
+
+    These only depend on the loaded papers, so they are computed once per data version
+    instead of re-running the groupbys on every widget interaction.
+    """
+    has_sub_theme = papers_df["sub_theme"].notna().to_numpy()
+    papers_with_sub = papers_df.loc[has_sub_theme]
+    quarter_counts = papers_df["quarter"].value_counts(sort=False)
+    if papers_df.empty:
+        theme_summary = pd.DataFrame(columns=["papers", "universities", "topics"])
+    else:
+        theme_summary = papers_df.groupby("theme", observed=True).agg(
+            papers=("title", "count"),
+            universities=("university", pd.Series.nunique),
+            topics=("topic_id", pd.Series.nunique),
+        )
+    return {
+        "theme_counts": papers_df.groupby("theme", observed=True).size(),
+        "theme_summary": theme_summary,
+        "sub_theme_summary": papers_with_sub.groupby("sub_theme", observed=True).agg(
+            papers=("title", "count"),
+            avg_confidence=("sub_theme_confidence", "mean"),
+        ),
+        "papers_with_sub_theme": len(papers_with_sub),
+        # value_counts on the categorical also lists empty quarters; keep observed ones only
+        "quarter_counts": quarter_counts[quarter_counts > 0],
+        "n_sub_themes": papers_df["sub_theme"].nunique(),
+        "n_universities": papers_df["university"].nunique(),
+        "university_counts": papers_df["university"].value_counts(),
+        "universities": sorted(papers_df["university"].unique()),
+        "sub_theme_counts": papers_df["sub_theme"].value_counts(),
+        "sub_themes": sorted(s for s in papers_df["sub_theme"].dropna().unique() if s),
+    }
+
+
+@st.cache_data(show_spinner=False, hash_funcs=FRAME_HASH_FUNCS)
+def normalized_name_map(values):
+    """
+    Map lower-cased keys to the labels used in the data, e.g. 'ai_machine_learning' -> 'AI_Machine_Learning'.
+
+    Widgets show display names; callers normalize the pick with ``.replace(" ", "_").lower()``
+    and look it up here instead of scanning ``values.unique()`` per pick. The first label
+    seen wins if two differ only in case.
+    """
+    name_map = {}
+    for name in values.dropna().unique():
+        name_map.setdefault(name.lower(), name)
+    return name_map
@@ -5,44 +5,121 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-import streamlit as st
 import json
 import os
+import re
+import time
+import tempfile
 import hashlib
+import functools
+from concurrent.futures import ThreadPoolExecutor
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 
 # Cache file for storing GPT-generated topic labels
 CACHE_FILE = "data/topic_labels_cache.json"
 
+# Maximum number of GPT label requests in flight at once
+LABEL_WORKERS = 10
+
+# Instructions shared by every label request. Keeping them in the system message, ahead of
+# the per-topic details, gives all requests an identical prefix for OpenAI's prompt caching.
+_LABEL_SYSTEM_PROMPT = """You create SHORT (2-4 word) research labels. Never list keywords.
+
+You are a research analyst identifying emerging topics. For the research topic described
+by the user (domain, keywords, paper count and growth), create a SHORT research topic
+label (2-4 words MAXIMUM) that:
+- Describes the SPECIFIC focus
+- Uses technical terms
+- Is concise and memorable
+
+Good examples:
+- "Medical Image AI"
+- "Blockchain Security"
+- "Edge IoT"
+- "Quantum Computing"
+
+Generate ONLY the label (2-4 words MAX), no quotes."""
+
+# Generic words and URL fragments dropped from topic keywords
+_NOISE_WORDS = frozenset({
+    'google', 'scholar', 'researchgate', 'pubmed', 'arxiv',
+    'et', 'al', 'doi', 'http', 'https', 'www',
+    'paper', 'study', 'research', 'analysis', 'approach',
+    'method', 'results', 'data', 'using', 'based',
+    'review', 'systematic', 'meta',
+    'journal', 'conference', 'proceedings', 'article'
+})
+_URL_FRAGMENT_RE = re.compile(r'http|www|\.com|\.org')
+
+
+@functools.lru_cache(maxsize=1)
+def _read_topic_labels_file(path, mtime_ns, size):
+    """Parse the label cache file; memoized on its stat so unchanged files are read once"""
+    try:
+        with open(path, 'rb') as f:
+            raw = f.read()
+        return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+    except Exception as e:
+        print(f"Error loading cache: {e}")
+        return {}
+
+
+def topic_labels_signature():
+    """(mtime_ns, size) of the label cache file, or None if there is none yet"""
+    try:
+        stat = os.stat(CACHE_FILE)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
 
 def load_topic_labels_cache():
     """Load cached topic labels from file"""
-    if os.path.exists(CACHE_FILE):
-        try:
-            with open(CACHE_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"Error loading cache: {e}")
-            return {}
-    return {}
+    signature = topic_labels_signature()
+    if signature is None:
+        return {}
+    # Callers add entries before saving, so hand out a copy of the memoized dict
+    return dict(_read_topic_labels_file(CACHE_FILE, *signature))
 
 
 def save_topic_labels_cache(cache):
     """Save topic labels cache to file"""
     try:
         os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
-        with open(CACHE_FILE, 'w', encoding='utf-8') as f:
-            json.dump(cache, f, indent=2, ensure_ascii=False)
+        # Write to a temp file and swap it in, so an interrupted save never leaves a truncated cache
+        tmp_file = f"{CACHE_FILE}.{os.getpid()}.tmp"
+        # Compact output: this is a cache, not a file meant for reading
+        if ORJSON_AVAILABLE:
+            payload = orjson.dumps(cache)
+        else:
+            payload = json.dumps(cache, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        with open(tmp_file, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_file, CACHE_FILE)
     except Exception as e:
         print(f"Error saving cache: {e}")
 
 
-def generate_topic_cache_key(keywords, theme, sub_theme, paper_count, growth_rate):
+def generate_topic_cache_key(keywords, theme, sub_theme):
     """Generate a unique cache key for a topic"""
-    # Create a stable string representation
-    key_string = f"{theme}|{sub_theme}|{','.join(sorted(keywords[:10]))}|{paper_count//10}|{int(growth_rate)}"
-    # Hash it for compact storage
-    return hashlib.md5(key_string.encode()).hexdigest()
+    # Keyed on what the label describes only; paper counts and growth change with every data refresh.
+    # Parts are fed to the hasher directly, separated by ASCII unit/record separators that
+    # cannot occur in theme names or keywords, instead of serialising a key dict first.
+    # blake2b is faster than the SHA-2/MD5 family; the key only needs to be collision-resistant.
+    h = hashlib.blake2b(digest_size=16)
+    h.update(str(theme).encode("utf-8"))
+    h.update(b"\x1e")
+    if not pd.isna(sub_theme):
+        h.update(b"\x1f" + str(sub_theme).encode("utf-8"))
+    h.update(b"\x1e")
+    for keyword in sorted(keywords[:10]):
+        h.update(keyword.encode("utf-8") + b"\x1f")
+    return h.hexdigest()
 
 
 def generate_insights(df, trends, mapping):
@@ -50,25 +127,36 @@ def generate_insights(df, trends, mapping):
     insights = []
     
     # 1. Emerging Sub-Themes (fastest growing)
-    sub_theme_growth = df.groupby(['sub_theme', df['date'].dt.year]).size().unstack(fill_value=0)
-    if len(sub_theme_growth.columns) >= 2:
-        recent_year = sub_theme_growth.columns[-1]
-        prev_year = sub_theme_growth.columns[-2]
-        growth_rates = ((sub_theme_growth[recent_year] - sub_theme_growth[prev_year]) / 
-                       (sub_theme_growth[prev_year] + 1) * 100)
-        top_emerging = growth_rates.nlargest(3)
+    # Only the two latest years with sub-themed papers are compared, so only those rows are counted
+    years = df['date'].dt.year
+    with_sub = df['sub_theme'].notna().to_numpy() & years.notna().to_numpy()
+    distinct_years = np.unique(years.to_numpy()[with_sub])
+    if len(distinct_years) >= 2:
+        prev_year, recent_year = distinct_years[-2:]
+        in_window = with_sub & years.isin([prev_year, recent_year]).to_numpy()
+        window_counts = (
+            df.loc[in_window]
+            .groupby(['sub_theme', years[in_window]], observed=True).size()
+            .unstack(fill_value=0)
+            .reindex(columns=[prev_year, recent_year], fill_value=0)
+        )
+        counts = window_counts.to_numpy()
+        growth_rates = (counts[:, 1] - counts[:, 0]) / (counts[:, 0] + 1) * 100
+        # argmax returns the first maximum, the same tie-break as nlargest
+        top = int(np.argmax(growth_rates))
         
-        if len(top_emerging) > 0 and top_emerging.iloc[0] > 20:
+        if growth_rates[top] > 20:
             insights.append({
                 "type": "emerging",
                 "icon": "",
                 "title": "Rapid Growth Detected",
-                "message": f"{top_emerging.index[0]} showing {top_emerging.iloc[0]:.0f}% growth",
-                "detail": f"From {int(sub_theme_growth.loc[top_emerging.index[0], prev_year])} papers ({prev_year}) to {int(sub_theme_growth.loc[top_emerging.index[0], recent_year])} ({recent_year})"
+                "message": f"{window_counts.index[top]} showing {growth_rates[top]:.0f}% growth",
+                "detail": f"From {int(counts[top, 0])} papers ({prev_year}) to {int(counts[top, 1])} ({recent_year})"
             })
     
     # 2. Collaboration Opportunities (low research volume but high strategic priority)
-    theme_counts = df.groupby('theme').size()
+    # Papers per theme; also the denominator for the quality insight below
+    theme_counts = df.groupby('theme', observed=True).size()
     high_priority_themes = [p['theme'] for p in trends.get('strategic_priorities', [])[:3]]
     for theme in high_priority_themes:
         if theme in theme_counts and theme_counts[theme] < 1500:
@@ -95,11 +183,13 @@ def generate_insights(df, trends, mapping):
     
     # 4. Quality vs Quantity
     if 'quality_score' in df.columns:
-        high_quality = df[df['quality_score'] > 70]
-        quality_by_theme = high_quality.groupby('theme').size().sort_values(ascending=False)
+        # Only the theme column of the high-quality rows is needed, not a filtered copy of the frame
+        high_quality_themes = df.loc[df['quality_score'] > 70, 'theme']
+        quality_by_theme = high_quality_themes.groupby(high_quality_themes, observed=True).size()
         if len(quality_by_theme) > 0:
-            top_quality_theme = quality_by_theme.index[0]
-            quality_pct = (quality_by_theme.iloc[0] / df[df['theme']==top_quality_theme].shape[0] * 100)
+            # Only the leader is shown, so take the max instead of sorting every theme
+            top_quality_theme = quality_by_theme.idxmax()
+            quality_pct = (quality_by_theme[top_quality_theme] / theme_counts[top_quality_theme] * 100)
             insights.append({
                 "type": "quality",
                 "icon": "",
@@ -109,268 +199,415 @@ def generate_insights(df, trends, mapping):
             })
     
     # 5. Temporal Trends
-    recent_6m = df[df['date'] >= (df['date'].max() - pd.Timedelta(days=180))]
-    recent_growth = len(recent_6m) / (len(df) - len(recent_6m)) * 100 if len(df) > len(recent_6m) else 0
+    # Only the number of recent papers is needed, so count the mask instead of slicing the frame
+    n_recent = int((df['date'] >= (df['date'].max() - pd.Timedelta(days=180))).sum())
+    recent_growth = n_recent / (len(df) - n_recent) * 100 if len(df) > n_recent else 0
     if recent_growth > 15:
         insights.append({
             "type": "trend",
             "icon": "",
             "title": "Accelerating Research",
             "message": f"Last 6 months show {recent_growth:.0f}% increase",
-            "detail": f"{len(recent_6m):,} recent papers indicate strong momentum"
+            "detail": f"{n_recent:,} recent papers indicate strong momentum"
         })
     
     # 6. Cross-theme opportunities
-    if 'all_scores' in str(mapping.values()):
-        # Find topics that span multiple themes (good for collaboration)
-        multi_theme_topics = []
-        for topic_id, data in mapping.items():
-            all_scores = data.get('all_scores', {})
-            high_scores = [t for t, s in all_scores.items() if s > 0.3]
-            if len(high_scores) > 1:
-                multi_theme_topics.append(topic_id)
-        
-        if len(multi_theme_topics) > 5:
-            insights.append({
-                "type": "collaboration",
-                "icon": "🤝",
-                "title": "Cross-Theme Potential",
-                "message": f"{len(multi_theme_topics)} topics span multiple themes",
-                "detail": "Strong opportunity for interdisciplinary collaboration"
-            })
+    # Find topics that span multiple themes (good for collaboration); entries without
+    # all_scores count as single-theme, so no separate check for the key is needed
+    multi_theme_count = sum(
+        1 for data in mapping.values()
+        if sum(1 for s in data.get('all_scores', {}).values() if s > 0.3) > 1
+    )
+    
+    if multi_theme_count > 5:
+        insights.append({
+            "type": "collaboration",
+            "icon": "🤝",
+            "title": "Cross-Theme Potential",
+            "message": f"{multi_theme_count} topics span multiple themes",
+            "detail": "Strong opportunity for interdisciplinary collaboration"
+        })
     
     return insights[:5]  # Return top 5 insights
 
 
 def filter_noisy_keywords(keywords):
     """Remove noisy/generic keywords"""
-    noise_words = {
-        'google', 'scholar', 'researchgate', 'pubmed', 'arxiv',
-        'et', 'al', 'doi', 'http', 'https', 'www',
-        'paper', 'study', 'research', 'analysis', 'approach',
-        'method', 'results', 'data', 'using', 'based',
-        'review', 'systematic', 'meta',
-        'journal', 'conference', 'proceedings', 'article'
-    }
-    
     filtered = []
     for kw in keywords:
         kw_lower = kw.lower()
-        if kw_lower not in noise_words and len(kw) > 2:
-            if not any(x in kw_lower for x in ['http', 'www', '.com', '.org']):
-                filtered.append(kw)
+        if len(kw) > 2 and kw_lower not in _NOISE_WORDS and not _URL_FRAGMENT_RE.search(kw_lower):
+            filtered.append(kw)
     
     return filtered[:8]
 
 
-def generate_topic_label_gpt(keywords, theme, sub_theme, paper_count, growth_rate):
-    """Generate meaningful topic label using GPT with caching"""
+def _fallback_topic_label(keywords, theme, clean_keywords=None):
+    """Keyword-based label used when GPT is unavailable or the request fails; never cached"""
+    clean_kw = filter_noisy_keywords(keywords) if clean_keywords is None else clean_keywords
+    if len(clean_kw) >= 2:
+        return f"{theme.replace('_', ' ')}: {' & '.join(clean_kw[:2])}"
+    return f"Topic in {theme.replace('_', ' ')}"
+
+
+def _topic_label_request_body(keywords, theme, sub_theme, paper_count, growth_rate, clean_keywords=None):
+    """
+    Build the chat completion request for one topic label.
+
+    clean_keywords, when given, is filter_noisy_keywords(keywords) already computed by the caller.
+
+    Returns:
+        Tuple of (request_body, domain, clean_keywords); the last two are needed to
+        post-process the reply with _clean_topic_label
+    """
+    if clean_keywords is None:
+        clean_keywords = filter_noisy_keywords(keywords)
+    if len(clean_keywords) < 3:
+        clean_keywords = keywords[:8]
+    
+    keywords_str = ", ".join(clean_keywords[:8])
+    domain = theme.replace('_', ' ').title()
+    # sub_theme is NaN (not None) for topics without one once it comes from a categorical column
+    sub_context = f"\nSub-area: {sub_theme.replace('_', ' ')}" if pd.notna(sub_theme) and sub_theme else ""
+    
+    prompt = f"""Domain: {domain}{sub_context}
+Keywords: {keywords_str}
+Papers: {paper_count}
+Growth: {growth_rate:.0f}%"""
+
+    body = {
+        "model": "gpt-4o-mini",
+        "messages": [
+            {"role": "system", "content": _LABEL_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ],
+        # Deterministic output, so a cached label is the label a fresh call would return
+        "temperature": 0,
+        "seed": 42,
+        "max_tokens": 30,
+    }
+    return body, domain, clean_keywords
+
+
+def _clean_topic_label(content, domain, clean_keywords):
+    """Strip quotes/prefixes from a GPT reply, falling back to keywords for one- or two-word labels"""
+    label = content.strip().strip('"').strip("'").strip('`')
+    
+    # Remove prefixes
+    for prefix in ['Topic:', 'Label:', 'Research Topic:', 'Emerging Topic:']:
+        if label.startswith(prefix):
+            label = label[len(prefix):].strip()
+    
+    return label if len(label.split()) >= 3 else f"{domain}: {' & '.join(clean_keywords[:2])}"
+
+
+@functools.lru_cache(maxsize=1)
+def _openai_client(api_key):
+    """OpenAI client shared by all label requests, so they reuse one connection pool"""
+    import openai
+    return openai.OpenAI(api_key=api_key)
+
+
+def _request_topic_label(keywords, theme, sub_theme, paper_count, growth_rate, clean_keywords=None):
+    """
+    Ask GPT for a topic label (no caching); safe to call from worker threads.
+
+    Returns None when no API key is set or the request fails, so callers can tell a
+    GPT label (safe to cache) from the keyword fallback (retried on the next run).
+    """
+    api_key = os.getenv('OPENAI_API_KEY')
+    if not api_key:
+        return None
+    import openai
+    
+    body, domain, prompt_keywords = _topic_label_request_body(
+        keywords, theme, sub_theme, paper_count, growth_rate, clean_keywords
+    )
+    try:
+        # The client retries rate-limited (429) requests with exponential backoff
+        response = _openai_client(api_key).chat.completions.create(**body)
+    except openai.OpenAIError as e:
+        print(f"Topic label request failed for {theme} ({type(e).__name__}): {e}")
+        return None
+    
+    content = response.choices[0].message.content
+    if not content:
+        print(f"Topic label request for {theme} returned no content")
+        return None
+    return _clean_topic_label(content, domain, prompt_keywords)
+
+
+def generate_topic_labels_batch(topic_args, poll_interval=30):
+    """
+    Generate labels for many topics with one OpenAI Batch API job.
+
+    Meant for offline/refresh runs: batch jobs are billed at a discount but may take
+    up to the 24h completion window, and this call blocks until the job finishes.
+    Topics whose request fails (or every topic, when no API key is set) get None, as with
+    _request_topic_label, so only real GPT labels end up in the label cache.
+
+    Args:
+        topic_args: List of dicts with keywords, theme, sub_theme, paper_count, growth_rate
+            and optionally clean_keywords
+        poll_interval: Seconds between batch status checks
+
+    Returns:
+        List of labels (or None), one per entry of topic_args
+    """
+    labels = [None] * len(topic_args)
+    api_key = os.getenv('OPENAI_API_KEY')
+    if not api_key or not topic_args:
+        return labels
     import openai
-    import os
     
+    requests = {i: _topic_label_request_body(**args) for i, args in enumerate(topic_args)}
+    try:
+        client = _openai_client(api_key)
+        with tempfile.NamedTemporaryFile('w', suffix='.jsonl', delete=False, encoding='utf-8') as f:
+            for i, (body, _, _) in requests.items():
+                f.write(json.dumps({"custom_id": str(i), "method": "POST", "url": "/v1/chat/completions", "body": body}) + "\n")
+            batch_path = f.name
+        try:
+            with open(batch_path, 'rb') as f:
+                batch_file = client.files.create(file=f, purpose='batch')
+        finally:
+            os.remove(batch_path)
+        
+        batch = client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint='/v1/chat/completions',
+            completion_window='24h'
+        )
+        while batch.status not in ('completed', 'failed', 'expired', 'cancelled'):
+            time.sleep(poll_interval)
+            batch = client.batches.retrieve(batch.id)
+        
+        # Expired batches still return the requests that finished in time
+        if batch.output_file_id:
+            for line in client.files.content(batch.output_file_id).text.splitlines():
+                result = json.loads(line)
+                response = result.get('response') or {}
+                if response.get('status_code') != 200:
+                    continue
+                content = response['body']['choices'][0]['message']['content']
+                if not content:
+                    continue
+                i = int(result['custom_id'])
+                _, domain, clean_keywords = requests[i]
+                labels[i] = _clean_topic_label(content, domain, clean_keywords)
+    except (openai.OpenAIError, OSError) as e:
+        print(f"Batch label generation failed ({type(e).__name__}): {e}")
+    
+    return labels
+
+
+def generate_topic_label_gpt(keywords, theme, sub_theme, paper_count, growth_rate):
+    """Generate meaningful topic label using GPT with caching"""
     # Load cache
     cache = load_topic_labels_cache()
     
     # Generate cache key
-    cache_key = generate_topic_cache_key(keywords, theme, sub_theme, paper_count, growth_rate)
+    cache_key = generate_topic_cache_key(keywords, theme, sub_theme)
     
     # Check if we have a cached label
     if cache_key in cache:
         return cache[cache_key]
     
-    api_key = os.getenv('OPENAI_API_KEY')
-    if not api_key:
-        # Fallback to cleaned keywords
-        clean_kw = filter_noisy_keywords(keywords)
-        if len(clean_kw) >= 2:
-            label = f"{theme.replace('_', ' ')}: {' & '.join(clean_kw[:2])}"
-        else:
-            label = f"Topic in {theme.replace('_', ' ')}"
-        
-        # Cache the fallback label
-        cache[cache_key] = label
-        save_topic_labels_cache(cache)
-        return label
+    label = _request_topic_label(keywords, theme, sub_theme, paper_count, growth_rate)
+    if label is None:
+        # Not cached, so the next call asks GPT again
+        return _fallback_topic_label(keywords, theme)
     
-    try:
-        openai.api_key = api_key
-        
-        clean_keywords = filter_noisy_keywords(keywords)
-        if len(clean_keywords) < 3:
-            clean_keywords = keywords[:8]
-        
-        keywords_str = ", ".join(clean_keywords[:8])
-        domain = theme.replace('_', ' ').title()
-        sub_context = f"\nSub-area: {sub_theme.replace('_', ' ')}" if sub_theme else ""
-        
-        prompt = f"""You are a research analyst identifying emerging topics.
+    # Cache the generated label
+    cache[cache_key] = label
+    save_topic_labels_cache(cache)
+    
+    return label
 
-Domain: {domain}{sub_context}
-Keywords: {keywords_str}
-Papers: {paper_count}
-Growth: {growth_rate:.0f}%
 
-Create a SHORT research topic label (2-4 words MAXIMUM) that:
-- Describes the SPECIFIC focus
-- Uses technical terms
-- Is concise and memorable
+def _score_topics(df, min_papers=5):
+    """
+    Vectorized per-topic recency/growth scoring for the emerging topics chart.
 
-Good examples:
-- "Medical Image AI"
-- "Blockchain Security"
-- "Edge IoT"
-- "Quantum Computing"
+    Papers are bucketed by topic with pd.factorize and aggregated with np.bincount,
+    and quarterly growth is read from a topic x quarter count matrix, so the cost is
+    a handful of array passes regardless of how many topics there are.
 
-Generate ONLY the label (2-4 words MAX), no quotes."""
+    Returns:
+        Dict of equal-length arrays (one entry per topic with at least min_papers
+        papers, excluding the -1 outlier topic), in first-appearance order.
+    """
+    codes, topic_values = pd.factorize(df['topic_id'])
+    n_topics = len(topic_values)
+    valid_rows = codes >= 0
+    paper_count = np.bincount(codes[valid_rows], minlength=n_topics)
+
+    # Recency: exponential decay on the mean age (in 30-day months) of each topic's papers
+    dates = df['date']
+    has_date = valid_rows & dates.notna().to_numpy()
+    dates_i8 = dates.to_numpy(dtype='datetime64[ns]').view('i8')
+    latest_i8 = dates.max().value if dates.notna().any() else 0
+    days_old = (latest_i8 - dates_i8[has_date]) // (24 * 3600 * 10**9)
+    dated_codes = codes[has_date]
+    dated_count = np.bincount(dated_codes, minlength=n_topics)
+    months_sum = np.bincount(dated_codes, weights=days_old / 30, minlength=n_topics)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        recency_score = np.exp(-(months_sum / dated_count) / 12)
+
+    # Growth: compare the most recent observed quarters within each topic
+    # Any chronologically ordered quarter number works here. load_data already stores 'quarter' as a
+    # categorical in chronological order, so its codes are reused; otherwise derive months since epoch // 3.
+    if 'quarter' in df.columns and isinstance(df['quarter'].dtype, pd.CategoricalDtype):
+        quarter_idx = df['quarter'].cat.codes.to_numpy()[has_date].astype(np.int64)
+    else:
+        quarter_idx = dates_i8[has_date].astype('datetime64[ns]').astype('datetime64[M]').astype(np.int64) // 3
+    growth_rate = np.zeros(n_topics)
+    if len(quarter_idx):
+        quarter_idx -= quarter_idx.min()
+        n_quarters = int(quarter_idx.max()) + 1
+        quarter_counts = np.bincount(
+            dated_codes * n_quarters + quarter_idx, minlength=n_topics * n_quarters
+        ).reshape(n_topics, n_quarters)
+        observed = quarter_counts > 0
+        n_observed = observed.sum(axis=1)
+        # Rank of each observed quarter counted from the latest one (1 = latest)
+        rank_from_end = np.cumsum(observed[:, ::-1], axis=1)[:, ::-1] * observed
 
-        response = openai.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You create SHORT (2-4 word) research labels. Never list keywords."},
-                {"role": "user", "content": prompt}
+        def nth_latest(n):
+            return np.where(rank_from_end == n, quarter_counts, 0).sum(axis=1)
+
+        last, second, third, fourth = nth_latest(1), nth_latest(2), nth_latest(3), nth_latest(4)
+        first = np.where((rank_from_end == n_observed[:, None]) & observed, quarter_counts, 0).sum(axis=1)
+        recent_avg = (last + second) / 2
+        older_avg = (third + fourth) / 2
+        growth_rate = np.select(
+            [n_observed >= 4, n_observed >= 2],
+            [
+                (recent_avg - older_avg) / np.maximum(older_avg, 1) * 100,
+                (last - first) / np.maximum(first, 1) * 100,
             ],
-            temperature=0.3,
-            max_tokens=30
+            default=0,
         )
-        
-        label = response.choices[0].message.content.strip().strip('"').strip("'").strip('`')
-        
-        # Remove prefixes
-        for prefix in ['Topic:', 'Label:', 'Research Topic:', 'Emerging Topic:']:
-            if label.startswith(prefix):
-                label = label[len(prefix):].strip()
-        
-        final_label = label if len(label.split()) >= 3 else f"{domain}: {' & '.join(clean_keywords[:2])}"
-        
-        # Cache the generated label
-        cache[cache_key] = final_label
-        save_topic_labels_cache(cache)
-        
-        return final_label
-        
-    except Exception as e:
-        # Fallback
-        clean_kw = filter_noisy_keywords(keywords)
-        if len(clean_kw) >= 2:
-            label = f"{theme.replace('_', ' ')}: {' & '.join(clean_kw[:2])}"
-        else:
-            label = f"Topic in {theme.replace('_', ' ')}"
-        
-        # Cache the fallback label
-        cache[cache_key] = label
-        save_topic_labels_cache(cache)
-        
-        return label
+
+    # First row of each topic supplies its theme / sub-theme labels
+    row_positions = np.flatnonzero(valid_rows)
+    _, first_seen = np.unique(codes[row_positions], return_index=True)
+    first_row = row_positions[first_seen]
+
+    if 'citations' in df.columns:
+        citations = pd.to_numeric(df['citations'], errors='coerce').to_numpy(dtype=float)
+        has_citations = valid_rows & ~np.isnan(citations)
+        citation_sum = np.bincount(codes[has_citations], weights=citations[has_citations], minlength=n_topics)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            avg_citations = citation_sum / np.bincount(codes[has_citations], minlength=n_topics)
+    else:
+        avg_citations = np.zeros(n_topics)
+
+    keep = (paper_count >= min_papers) & (np.asarray(topic_values) != -1)
+    rows = first_row[keep]
+    return {
+        'topic_id': np.asarray(topic_values)[keep],
+        'theme': df['theme'].to_numpy()[rows] if 'theme' in df.columns else np.full(len(rows), 'Unknown'),
+        'sub_theme': df['sub_theme'].to_numpy()[rows] if 'sub_theme' in df.columns else np.full(len(rows), None),
+        'recency_score': recency_score[keep],
+        'growth_rate': growth_rate[keep],
+        'paper_count': paper_count[keep],
+        'avg_citations': avg_citations[keep],
+    }
 
 
-def create_emerging_topics_bubble(df, mapping, top_n=20):
+def create_emerging_topics_bubble(df, mapping, top_n=20, use_batch_api=False):
     """
     Create bubble chart showing emerging topics with GPT-generated labels
     X-axis: Recency score (how recent)
     Y-axis: Growth rate (how fast growing)
     Size: Paper volume
     Color: Theme
+
+    With use_batch_api=True, uncached labels are generated through one Batch API job
+    (see generate_topic_labels_batch); use it only from offline precompute runs, since
+    the call blocks until the batch completes.
+
+    Renders nothing itself, so it can run inside a cached wrapper; the emerging_df
+    'label_source' column ('cache', 'gpt' or 'keywords') lets the caller report label status.
     """
     # Calculate emergingness metrics for each topic
-    emerging_data = []
-    
-    df_copy = df.copy()
-    df_copy['date'] = pd.to_datetime(df_copy['date'])
-    latest_date = df_copy['date'].max()
-    
-    for topic_id in df_copy['topic_id'].unique():
-        if topic_id == -1:  # Skip outliers
-            continue
-        
-        topic_papers = df_copy[df_copy['topic_id'] == topic_id]
-        
-        if len(topic_papers) < 5:  # Skip small topics
-            continue
-        
-        # Calculate recency score
-        topic_papers['months_old'] = (latest_date - topic_papers['date']).dt.days / 30
-        recency_score = np.exp(-topic_papers['months_old'].mean() / 12)  # Exponential decay
-        
-        # Calculate growth rate
-        topic_papers['quarter'] = topic_papers['date'].dt.to_period('Q')
-        quarterly_counts = topic_papers.groupby('quarter').size().sort_index()
-        
-        if len(quarterly_counts) >= 4:
-            recent_avg = quarterly_counts.iloc[-2:].mean()
-            older_avg = quarterly_counts.iloc[-4:-2].mean()
-            growth_rate = ((recent_avg - older_avg) / max(older_avg, 1)) * 100
-        elif len(quarterly_counts) >= 2:
-            growth_rate = ((quarterly_counts.iloc[-1] - quarterly_counts.iloc[0]) / max(quarterly_counts.iloc[0], 1)) * 100
-        else:
-            growth_rate = 0
-        
-        # Get theme and keywords
-        topic_id_str = str(topic_id)
-        theme = topic_papers['theme'].iloc[0] if 'theme' in topic_papers.columns else 'Unknown'
-        sub_theme = topic_papers['sub_theme'].iloc[0] if 'sub_theme' in topic_papers.columns else None
-        
-        keywords = []
-        if topic_id_str in mapping:
-            keywords = mapping[topic_id_str].get('keywords', [])[:10]
-        
-        emerging_data.append({
-            'topic_id': topic_id,
-            'keywords_list': keywords,
-            'theme': theme,
-            'sub_theme': sub_theme,
-            'recency_score': recency_score * 100,  # Convert to percentage
-            'growth_rate': growth_rate,
-            'paper_count': len(topic_papers),
-            'avg_citations': topic_papers['citations'].mean() if 'citations' in topic_papers.columns else 0,
-            'keywords': ', '.join(filter_noisy_keywords(keywords)[:5])
-        })
+    # _score_topics only reads the frame, so copy it only when dates still need parsing
+    if not pd.api.types.is_datetime64_any_dtype(df['date']):
+        df = df.assign(date=pd.to_datetime(df['date']))
+    scores = _score_topics(df)
     
-    emerging_df = pd.DataFrame(emerging_data)
+    emerging_df = pd.DataFrame({
+        'topic_id': scores['topic_id'],
+        'theme': scores['theme'],
+        'sub_theme': scores['sub_theme'],
+        'recency_score': scores['recency_score'] * 100,  # Convert to percentage
+        'growth_rate': scores['growth_rate'],
+        'paper_count': scores['paper_count'],
+        'avg_citations': scores['avg_citations'],
+    })
     
     # Calculate emergingness score and filter top N
+    # Computed on the score arrays directly rather than through intermediate Series
+    recency = emerging_df['recency_score'].to_numpy()
+    growth = emerging_df['growth_rate'].to_numpy()
+    papers = emerging_df['paper_count'].to_numpy(dtype=np.float64)
+    max_papers = papers.max() if len(papers) else 1.0
     emerging_df['emergingness'] = (
-        0.4 * (emerging_df['recency_score'] / 100) +
-        0.4 * ((emerging_df['growth_rate'] + 100) / 200) +  # Normalize growth
-        0.2 * (emerging_df['paper_count'] / emerging_df['paper_count'].max())
+        0.4 * (recency / 100) +
+        0.4 * ((growth + 100) / 200) +  # Normalize growth
+        0.2 * (papers / max_papers)
     )
     
     emerging_df = emerging_df.nlargest(top_n, 'emergingness')
+    # Keywords are only needed for the plotted topics, so look up and clean just those
+    emerging_df.insert(1, 'keywords_list', [
+        mapping.get(str(topic_id), {}).get('keywords', [])[:10] for topic_id in emerging_df['topic_id']
+    ])
+    # Filtered once per topic; the hover text and the label requests both use it
+    clean_keywords_lists = [filter_noisy_keywords(k) for k in emerging_df['keywords_list']]
+    emerging_df.insert(
+        emerging_df.columns.get_loc('emergingness'), 'keywords',
+        [', '.join(clean[:5]) for clean in clean_keywords_lists]
+    )
     
     # Generate GPT labels for top topics (with caching)
     cache = load_topic_labels_cache()
-    cached_count = 0
-    new_count = 0
-    
-    with st.spinner('Generating topic labels (using cached where available)...'):
-        labels = []
-        for _, row in emerging_df.iterrows():
-            cache_key = generate_topic_cache_key(
-                keywords=row['keywords_list'],
-                theme=row['theme'],
-                sub_theme=row['sub_theme'],
-                paper_count=row['paper_count'],
-                growth_rate=row['growth_rate']
-            )
-            
-            # Check if cached
-            if cache_key in cache:
-                cached_count += 1
-            else:
-                new_count += 1
-            
-            label = generate_topic_label_gpt(
-                keywords=row['keywords_list'],
-                theme=row['theme'],
-                sub_theme=row['sub_theme'],
-                paper_count=row['paper_count'],
-                growth_rate=row['growth_rate']
-            )
-            labels.append(label)
-        emerging_df['topic_label'] = labels
-    
-    # Show cache statistics
-    if cached_count > 0 or new_count > 0:
-        st.success(f"✅ Topic labels ready: {cached_count} from cache, {new_count} newly generated")
+    topic_args = [
+        dict(keywords=keywords, theme=theme, sub_theme=sub_theme, paper_count=paper_count,
+             growth_rate=growth_rate, clean_keywords=clean_keywords)
+        for keywords, theme, sub_theme, paper_count, growth_rate, clean_keywords in zip(
+            emerging_df['keywords_list'], emerging_df['theme'], emerging_df['sub_theme'],
+            emerging_df['paper_count'], emerging_df['growth_rate'], clean_keywords_lists
+        )
+    ]
+    cache_keys = [generate_topic_cache_key(args['keywords'], args['theme'], args['sub_theme']) for args in topic_args]
+    # Where each label comes from: the label cache, a new GPT request, or keywords (GPT failed)
+    label_source = ['cache' if key in cache else None for key in cache_keys]
+    # Topics sharing a cache key are only requested once
+    missing = list(dict.fromkeys(key for key in cache_keys if key not in cache))
+    
+    if missing:
+        args_by_key = dict(zip(cache_keys, topic_args))
+        if use_batch_api:
+            new_labels = generate_topic_labels_batch([args_by_key[key] for key in missing])
+        else:
+            # Uncached labels are requested concurrently; the pool size caps in-flight API calls
+            with ThreadPoolExecutor(max_workers=min(LABEL_WORKERS, len(missing))) as pool:
+                new_labels = list(pool.map(lambda key: _request_topic_label(**args_by_key[key]), missing))
+        # Only GPT labels are cached; failed topics are retried on the next run
+        generated = {key: label for key, label in zip(missing, new_labels) if label is not None}
+        if generated:
+            cache.update(generated)
+            save_topic_labels_cache(cache)
+    emerging_df['topic_label'] = [
+        cache[key] if key in cache
+        else _fallback_topic_label(args['keywords'], args['theme'], args['clean_keywords'])
+        for key, args in zip(cache_keys, topic_args)
+    ]
+    emerging_df['label_source'] = [
+        source or ('gpt' if key in cache else 'keywords') for source, key in zip(label_source, cache_keys)
+    ]
     
     # Create bubble chart with smaller, more visible bubbles
     fig = px.scatter(
@@ -395,7 +632,8 @@ def create_emerging_topics_bubble(df, mapping, top_n=20):
             'paper_count': 'Papers',
             'theme': 'Theme'
         },
-        color_discrete_sequence=['#60a5fa', '#34d399', '#fbbf24', '#f87171', '#a78bfa', '#fb923c', '#22d3ee', '#facc15']
+        color_discrete_sequence=['#60a5fa', '#34d399', '#fbbf24', '#f87171', '#a78bfa', '#fb923c', '#22d3ee', '#facc15'],
+        render_mode='webgl'  # scattergl keeps redraws cheap as top_n grows
     )
     
     # Update marker size and visibility
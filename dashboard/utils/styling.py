@@ -1,50 +1,54 @@
 """Styling and UI helper functions."""
+import functools
+
 import plotly.graph_objects as go
 
 
+@functools.lru_cache(maxsize=512)
+def pretty_name(key: str) -> str:
+    """Display name for a theme/sub-theme key, e.g. 'AI_Machine_Learning' -> 'Ai Machine Learning'"""
+    return key.replace("_", " ").title()
+
+
+# Dark theme settings shared by every chart; built once instead of on each apply_fig_theme call
+_FIG_LAYOUT = dict(
+    paper_bgcolor="#1e293b",
+    plot_bgcolor="#0f172a",
+    font=dict(family="Inter, sans-serif", color="#f1f5f9", size=12),
+    margin=dict(l=60, r=40, t=60, b=50),
+    title_font=dict(size=18, color="#f1f5f9"),
+    legend=dict(
+        bgcolor="rgba(30,41,59,0.9)",
+        bordercolor="#334155",
+        borderwidth=1,
+        font=dict(size=11, color="#cbd5e1")
+    ),
+    hoverlabel=dict(
+        bgcolor="#1e293b",
+        font_size=12,
+        font_family="Inter, sans-serif",
+        font_color="#f1f5f9",
+        bordercolor="#334155"
+    )
+)
+_FIG_AXIS = dict(
+    showgrid=True,
+    gridwidth=1,
+    gridcolor='#334155',
+    showline=True,
+    linewidth=1,
+    linecolor='#475569',
+    color='#cbd5e1'
+)
+
+
 def apply_fig_theme(fig: go.Figure, height: int = 360) -> go.Figure:
     """Apply dark theme to plotly figures"""
-    fig.update_layout(
-        height=height,
-        paper_bgcolor="#1e293b",
-        plot_bgcolor="#0f172a",
-        font=dict(family="Inter, sans-serif", color="#f1f5f9", size=12),
-        margin=dict(l=60, r=40, t=60, b=50),
-        title_font=dict(size=18, color="#f1f5f9"),
-        legend=dict(
-            bgcolor="rgba(30,41,59,0.9)",
-            bordercolor="#334155",
-            borderwidth=1,
-            font=dict(size=11, color="#cbd5e1")
-        ),
-        hoverlabel=dict(
-            bgcolor="#1e293b",
-            font_size=12,
-            font_family="Inter, sans-serif",
-            font_color="#f1f5f9",
-            bordercolor="#334155"
-        )
-    )
+    fig.update_layout(height=height, **_FIG_LAYOUT)
     
     # Update axes for dark theme
-    fig.update_xaxes(
-        showgrid=True,
-        gridwidth=1,
-        gridcolor='#334155',
-        showline=True,
-        linewidth=1,
-        linecolor='#475569',
-        color='#cbd5e1'
-    )
-    fig.update_yaxes(
-        showgrid=True,
-        gridwidth=1,
-        gridcolor='#334155',
-        showline=True,
-        linewidth=1,
-        linecolor='#475569',
-        color='#cbd5e1'
-    )
+    fig.update_xaxes(**_FIG_AXIS)
+    fig.update_yaxes(**_FIG_AXIS)
     
     return fig
 
@@ -92,70 +96,66 @@ def create_insight_card(title: str, message: str, icon: str = ""):
     """
 
 
+# Growth-rate buckets for get_growth_color_style: (lower bound in %, style, label format).
+# Styles are built once at import; only the label depends on the actual rate.
+_GROWTH_COLOR_BUCKETS = (
+    (50, {
+        "bg": "linear-gradient(135deg, #065f46 0%, #047857 100%)",
+        "border": "#10b981",
+        "icon": "▲▲",
+        "color": "#ffffff",
+        "icon_color": "#6ee7b7"
+    }, "+{:.0f}%"),
+    (20, {
+        "bg": "linear-gradient(135deg, #047857 0%, #059669 100%)",
+        "border": "#34d399",
+        "icon": "▲",
+        "color": "#ffffff",
+        "icon_color": "#a7f3d0"
+    }, "+{:.0f}%"),
+    (5, {
+        "bg": "linear-gradient(135deg, #059669 0%, #10b981 100%)",
+        "border": "#6ee7b7",
+        "icon": "▲",
+        "color": "#ffffff",
+        "icon_color": "#d1fae5"
+    }, "+{:.0f}%"),
+    (0, {
+        "bg": "linear-gradient(135deg, #10b981 0%, #34d399 100%)",
+        "border": "#a7f3d0",
+        "icon": "→",
+        "color": "#ffffff",
+        "icon_color": "#d1fae5"
+    }, "+{:.1f}%"),
+    (-5, {
+        "bg": "linear-gradient(135deg, #dc2626 0%, #ef4444 100%)",
+        "border": "#fca5a5",
+        "icon": "→",
+        "color": "#ffffff",
+        "icon_color": "#fecaca"
+    }, "{:.1f}%"),
+    (-20, {
+        "bg": "linear-gradient(135deg, #b91c1c 0%, #dc2626 100%)",
+        "border": "#f87171",
+        "icon": "▼",
+        "color": "#ffffff",
+        "icon_color": "#fca5a5"
+    }, "{:.0f}%"),
+    (float("-inf"), {
+        "bg": "linear-gradient(135deg, #991b1b 0%, #b91c1c 100%)",
+        "border": "#ef4444",
+        "icon": "▼▼",
+        "color": "#ffffff",
+        "icon_color": "#f87171"
+    }, "{:.0f}%"),
+)
+
+
 def get_growth_color_style(growth_rate):
     """Generate darker, solid color gradients based on growth rate for dark theme"""
     growth_pct = growth_rate * 100
-    
-    if growth_pct >= 50:
-        return {
-            "bg": "linear-gradient(135deg, #065f46 0%, #047857 100%)",
-            "border": "#10b981",
-            "icon": "▲▲",
-            "label": f"+{growth_pct:.0f}%",
-            "color": "#ffffff",
-            "icon_color": "#6ee7b7"
-        }
-    elif growth_pct >= 20:
-        return {
-            "bg": "linear-gradient(135deg, #047857 0%, #059669 100%)",
-            "border": "#34d399",
-            "icon": "▲",
-            "label": f"+{growth_pct:.0f}%",
-            "color": "#ffffff",
-            "icon_color": "#a7f3d0"
-        }
-    elif growth_pct >= 5:
-        return {
-            "bg": "linear-gradient(135deg, #059669 0%, #10b981 100%)",
-            "border": "#6ee7b7",
-            "icon": "▲",
-            "label": f"+{growth_pct:.0f}%",
-            "color": "#ffffff",
-            "icon_color": "#d1fae5"
-        }
-    elif growth_pct >= 0:
-        return {
-            "bg": "linear-gradient(135deg, #10b981 0%, #34d399 100%)",
-            "border": "#a7f3d0",
-            "icon": "→",
-            "label": f"+{growth_pct:.1f}%",
-            "color": "#ffffff",
-            "icon_color": "#d1fae5"
-        }
-    elif growth_pct >= -5:
-        return {
-            "bg": "linear-gradient(135deg, #dc2626 0%, #ef4444 100%)",
-            "border": "#fca5a5",
-            "icon": "→",
-            "label": f"{growth_pct:.1f}%",
-            "color": "#ffffff",
-            "icon_color": "#fecaca"
-        }
-    elif growth_pct >= -20:
-        return {
-            "bg": "linear-gradient(135deg, #b91c1c 0%, #dc2626 100%)",
-            "border": "#f87171",
-            "icon": "▼",
-            "label": f"{growth_pct:.0f}%",
-            "color": "#ffffff",
-            "icon_color": "#fca5a5"
-        }
-    else:
-        return {
-            "bg": "linear-gradient(135deg, #991b1b 0%, #b91c1c 100%)",
-            "border": "#ef4444",
-            "icon": "▼▼",
-            "label": f"{growth_pct:.0f}%",
-            "color": "#ffffff",
-            "icon_color": "#f87171"
-        }
+    for lower_bound, style, label_fmt in _GROWTH_COLOR_BUCKETS:
+        if growth_pct >= lower_bound:
+            return {**style, "label": label_fmt.format(growth_pct)}
+    # NaN growth falls through every comparison, as it did the original else-branch
+    return {**_GROWTH_COLOR_BUCKETS[-1][1], "label": _GROWTH_COLOR_BUCKETS[-1][2].format(growth_pct)}
@@ -4,33 +4,29 @@ import plotly.express as px
 import plotly.graph_objects as go
 import numpy as np
 
+from dashboard.utils.styling import pretty_name
+
 
 def create_sunburst_chart(df, mapping):
     """Create hierarchical sunburst: Theme > Sub-theme > Topic"""
-    # Build hierarchy data - ensure we capture ALL themes and sub-themes
-    hierarchy_data = []
-    
-    for _, row in df.iterrows():
-        topic_id = str(row['topic_id'])
-        parent_theme = row['theme']
-        sub_theme = row.get('sub_theme')
-        
-        # Use 'Other' only if sub_theme is truly missing
-        if pd.isna(sub_theme) or sub_theme == '' or sub_theme is None:
-            sub_theme = 'Other'
-        
-        hierarchy_data.append({
-            'parent_theme': parent_theme,
-            'sub_theme': sub_theme,
-            'topic_id': topic_id,
-            'count': 1
-        })
-    
-    hierarchy_df = pd.DataFrame(hierarchy_data)
-    
-    # Aggregate counts at each level
-    theme_counts = hierarchy_df.groupby(['parent_theme']).size().reset_index(name='count')
-    subtheme_counts = hierarchy_df.groupby(['parent_theme', 'sub_theme']).size().reset_index(name='count')
+    # Build hierarchy counts - ensure we capture ALL themes and sub-themes.
+    # Use 'Other' only if sub_theme is truly missing
+    if 'sub_theme' in df.columns:
+        sub_themes = df['sub_theme'].astype(object)
+        sub_themes = sub_themes.where(sub_themes.notna() & (sub_themes != ''), 'Other')
+    else:
+        sub_themes = pd.Series('Other', index=df.index, dtype=object)
+    
+    # Aggregate counts at each level; one groupby over the papers, then theme totals from the
+    # (theme, sub-theme) table. Rows are ordered by name, as a groupby over plain strings would be.
+    subtheme_counts = (
+        df.groupby([df['theme'].rename('parent_theme'), sub_themes.rename('sub_theme')], observed=True)
+        .size()
+        .reset_index(name='count')
+        .astype({'parent_theme': object})
+        .sort_values(['parent_theme', 'sub_theme'], ignore_index=True)
+    )
+    theme_counts = subtheme_counts.groupby('parent_theme')['count'].sum().reset_index()
     
     # Build sunburst data structure
     labels = []
@@ -55,7 +51,7 @@ def create_sunburst_chart(df, mapping):
     
     # Add ALL themes (parent level) - 1st outer ring with blue shades
     for i, (_, row) in enumerate(theme_counts.iterrows()):
-        theme_name = row['parent_theme'].replace('_', ' ').title()
+        theme_name = pretty_name(row['parent_theme'])
         labels.append(theme_name)
         parents.append('All Research')
         values.append(row['count'])
@@ -65,34 +61,29 @@ def create_sunburst_chart(df, mapping):
     
     # Add ALL sub-themes (middle level) - 2nd outer ring with gradients from dark to light
     for parent_theme in subtheme_counts['parent_theme'].unique():
-        theme_subthemes = subtheme_counts[subtheme_counts['parent_theme'] == parent_theme].copy()
+        theme_subthemes = subtheme_counts[subtheme_counts['parent_theme'] == parent_theme]
         theme_subthemes = theme_subthemes.sort_values('count', ascending=False)
         
         base_color = theme_colors.get(parent_theme, blue_shades[0])
         num_subthemes = len(theme_subthemes)
         
-        for idx, (_, row) in enumerate(theme_subthemes.iterrows()):
-            sub_name = row['sub_theme'].replace('_', ' ').title()
-            parent_name = row['parent_theme'].replace('_', ' ').title()
-            labels.append(sub_name)
-            parents.append(parent_name)
-            values.append(row['count'])
-            
-            # Create gradient: darkest for most papers, lightest for least papers
-            if num_subthemes > 1:
-                brightness_factor = 1.0 - (idx / (num_subthemes - 1)) * 0.6
-            else:
-                brightness_factor = 1.0
-            
-            # Convert hex to RGB, adjust brightness, convert back
-            hex_color = base_color.lstrip('#')
-            r, g, b = int(hex_color[0:2], 16), int(hex_color[2:4], 16), int(hex_color[4:6], 16)
-            r = int(r * brightness_factor + 255 * (1 - brightness_factor))
-            g = int(g * brightness_factor + 255 * (1 - brightness_factor))
-            b = int(b * brightness_factor + 255 * (1 - brightness_factor))
-            
-            gradient_color = f'#{r:02x}{g:02x}{b:02x}'
-            colors.append(gradient_color)
+        parent_name = pretty_name(parent_theme)
+        labels.extend(pretty_name(sub_theme) for sub_theme in theme_subthemes['sub_theme'])
+        parents.extend([parent_name] * num_subthemes)
+        values.extend(theme_subthemes['count'].tolist())
+        
+        # Create gradient: darkest for most papers, lightest for least papers
+        if num_subthemes > 1:
+            brightness_factor = 1.0 - (np.arange(num_subthemes) / (num_subthemes - 1)) * 0.6
+        else:
+            brightness_factor = np.ones(num_subthemes)
+        
+        # Blend the base RGB towards white for the whole group at once (truncating, as int() did)
+        hex_color = base_color.lstrip('#')
+        base_rgb = np.array([int(hex_color[i:i + 2], 16) for i in (0, 2, 4)])
+        brightness_factor = brightness_factor[:, None]
+        mixed = (base_rgb * brightness_factor + 255 * (1 - brightness_factor)).astype(np.int64)
+        colors.extend('#%02x%02x%02x' % tuple(rgb) for rgb in mixed.tolist())
     
     fig = go.Figure(go.Sunburst(
         labels=labels,
@@ -123,7 +114,8 @@ def create_sunburst_chart(df, mapping):
 
 def create_sankey_flow(df):
     """Sankey diagram: Theme → Sub-Theme → University"""
-    top_unis = df['university'].value_counts().head(10).index
+    uni_counts = df['university'].value_counts()
+    top_unis = uni_counts[uni_counts > 0].head(10).index
     top_subthemes = df['sub_theme'].value_counts().head(15).index
     
     df_filtered = df[df['university'].isin(top_unis) & df['sub_theme'].isin(top_subthemes)]
@@ -144,26 +136,28 @@ def create_sankey_flow(df):
     targets = []
     values = []
     
+    # Count each flow once with a groupby, then emit links in the same node order as before
+    theme_pos = {theme: i for i, theme in enumerate(themes)}
+    subtheme_pos = {subtheme: i for i, subtheme in enumerate(subthemes)}
+    uni_pos = {uni: i for i, uni in enumerate(unis)}
+    
     # Theme → Sub-theme flows
-    for theme in themes:
-        theme_label = theme.replace('_', ' ')
-        for subtheme in subthemes:
-            subtheme_label = subtheme.replace('_', ' ')
-            count = len(df_filtered[(df_filtered['theme'] == theme) & (df_filtered['sub_theme'] == subtheme)])
-            if count > 0:
-                sources.append(label_to_idx[theme_label])
-                targets.append(label_to_idx[subtheme_label])
-                values.append(count)
+    theme_flows = df_filtered.groupby(['theme', 'sub_theme'], observed=True).size()
+    for (theme, subtheme), count in sorted(
+        theme_flows[theme_flows > 0].items(), key=lambda kv: (theme_pos[kv[0][0]], subtheme_pos[kv[0][1]])
+    ):
+        sources.append(label_to_idx[theme.replace('_', ' ')])
+        targets.append(label_to_idx[subtheme.replace('_', ' ')])
+        values.append(count)
     
     # Sub-theme → University flows
-    for subtheme in subthemes:
-        subtheme_label = subtheme.replace('_', ' ')
-        for uni in unis:
-            count = len(df_filtered[(df_filtered['sub_theme'] == subtheme) & (df_filtered['university'] == uni)])
-            if count > 0:
-                sources.append(label_to_idx[subtheme_label])
-                targets.append(label_to_idx[uni])
-                values.append(count)
+    uni_flows = df_filtered.groupby(['sub_theme', 'university'], observed=True).size()
+    for (subtheme, uni), count in sorted(
+        uni_flows[uni_flows > 0].items(), key=lambda kv: (subtheme_pos[kv[0][0]], uni_pos[kv[0][1]])
+    ):
+        sources.append(label_to_idx[subtheme.replace('_', ' ')])
+        targets.append(label_to_idx[uni])
+        values.append(count)
     
     # Create color palette for nodes
     num_themes = len(themes)
@@ -212,8 +206,9 @@ def create_trend_timeline(df):
     df_copy = df.copy()
     df_copy['year_month'] = df_copy['date'].dt.to_period('M')
     
-    monthly_counts = df_copy.groupby(['year_month', 'theme']).size().reset_index(name='count')
+    monthly_counts = df_copy.groupby(['year_month', 'theme'], observed=True).size().reset_index(name='count')
     monthly_counts['year_month'] = monthly_counts['year_month'].dt.to_timestamp()
+    monthly_counts['theme'] = monthly_counts['theme'].astype(str)
     
     blue_palette = [
         '#3b82f6', '#2563eb', '#06b6d4', '#8b5cf6', '#60a5fa',
@@ -260,7 +255,7 @@ def create_growth_heatmap(df):
     df_copy = df.copy()
     df_copy['year_quarter'] = df_copy['date'].dt.to_period('Q').astype(str)
     
-    heatmap_data = df_copy.groupby(['sub_theme', 'year_quarter']).size().unstack(fill_value=0)
+    heatmap_data = df_copy.groupby(['sub_theme', 'year_quarter'], observed=True).size().unstack(fill_value=0)
     active_subthemes = heatmap_data.sum(axis=1).nlargest(15).index
     heatmap_data = heatmap_data.loc[active_subthemes]
     heatmap_data.index = [idx.replace('_', ' ') for idx in heatmap_data.index]
@@ -309,31 +304,39 @@ def create_growth_heatmap(df):
 
 def create_impact_bubble_chart(df, mapping):
     """Bubble chart: Growth vs Citations vs Volume"""
-    df_copy = df.copy()
-    df_copy['year'] = df_copy['date'].dt.year
-    
-    metrics = []
-    for sub_theme in df_copy['sub_theme'].dropna().unique():
-        sub_df = df_copy[df_copy['sub_theme'] == sub_theme]
-        
-        if len(sub_df) < 5:
-            continue
-        
-        growth_2023 = len(sub_df[sub_df['year'] == 2023])
-        growth_2024 = len(sub_df[sub_df['year'] == 2024])
-        growth_rate = ((growth_2024 - growth_2023) / (growth_2023 + 1)) * 100 if growth_2023 > 0 else 0
-        avg_citations = sub_df['citations'].mean()
-        parent_theme = sub_df['theme'].mode()[0] if len(sub_df) > 0 else 'Other'
-        
-        metrics.append({
-            'sub_theme': sub_theme.replace('_', ' '),
-            'growth_rate': growth_rate,
-            'avg_citations': avg_citations,
-            'paper_count': len(sub_df),
-            'parent_theme': parent_theme.replace('_', ' ')
-        })
+    # One grouped pass per metric instead of re-filtering the frame for every sub-theme
+    year = df['date'].dt.year
+    grouped = df.groupby('sub_theme', observed=True)
+    stats = pd.DataFrame({
+        'paper_count': grouped.size(),
+        'avg_citations': grouped['citations'].mean(),
+        'growth_2023': (year == 2023).groupby(df['sub_theme'], observed=True).sum(),
+        'growth_2024': (year == 2024).groupby(df['sub_theme'], observed=True).sum(),
+    })
+    # Parent theme is the most common theme per sub-theme; the stable sort keeps the first
+    # theme in sort order on ties, as Series.mode()[0] did
+    theme_counts = df.groupby(['sub_theme', 'theme'], observed=True).size()
+    stats['parent_theme'] = (
+        theme_counts.sort_values(ascending=False, kind='stable')
+        .reset_index()
+        .drop_duplicates('sub_theme')
+        .set_index('sub_theme')['theme']
+    )
     
-    metrics_df = pd.DataFrame(metrics)
+    # Keep sub-themes in order of first appearance and drop the ones with fewer than 5 papers
+    stats.index = stats.index.astype(object)
+    stats = stats.loc[df['sub_theme'].dropna().unique().tolist()]
+    stats = stats[stats['paper_count'] >= 5]
+    
+    growth_2023 = stats['growth_2023'].to_numpy()
+    growth_2024 = stats['growth_2024'].to_numpy()
+    metrics_df = pd.DataFrame({
+        'sub_theme': stats.index.str.replace('_', ' '),
+        'growth_rate': np.where(growth_2023 > 0, ((growth_2024 - growth_2023) / (growth_2023 + 1)) * 100, 0),
+        'avg_citations': stats['avg_citations'].to_numpy(),
+        'paper_count': stats['paper_count'].to_numpy(),
+        'parent_theme': stats['parent_theme'].astype(object).str.replace('_', ' ').to_numpy(),
+    })
     
     fig = px.scatter(
         metrics_df,
@@ -351,7 +354,8 @@ def create_impact_bubble_chart(df, mapping):
         },
         title=" ",
         text='parent_theme',  # Show theme names on bubbles
-        size_max=12  # Normal, standard bubble size
+        size_max=12,  # Normal, standard bubble size
+        render_mode='webgl'  # scattergl: cheaper redraws when many sub-themes are plotted
     )
     
     # Update traces for dark theme with normal-sized bubbles
@@ -409,18 +413,22 @@ def create_university_radar(df, selected_unis):
     if not selected_unis or len(selected_unis) < 2:
         return None
     
-    top_subthemes = df['sub_theme'].value_counts().head(10).index
+    subtheme_counts = df['sub_theme'].value_counts()
+    top_subthemes = subtheme_counts[subtheme_counts > 0].head(10).index
+    
+    # Papers per (university, sub-theme) in one grouped pass over the selected universities
+    unis = selected_unis[:5]
+    uni_papers = df[df['university'].isin(unis)]
+    counts_by_uni = (
+        uni_papers.groupby(['university', 'sub_theme'], observed=True).size()
+        .unstack(fill_value=0)
+        .reindex(index=unis, columns=top_subthemes, fill_value=0)
+    )
     fig = go.Figure()
     
-    for uni in selected_unis[:5]:
-        uni_data = df[df['university'] == uni]
-        counts = []
-        for subtheme in top_subthemes:
-            count = len(uni_data[uni_data['sub_theme'] == subtheme])
-            counts.append(count)
-        
+    for uni in unis:
         fig.add_trace(go.Scatterpolar(
-            r=counts,
+            r=counts_by_uni.loc[uni].tolist(),
             theta=[s.replace('_', ' ')[:20] for s in top_subthemes],
             fill='toself',
             name=uni
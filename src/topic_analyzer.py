@@ -16,6 +16,13 @@ import logging
 from datetime import datetime
 import os
 
+# Errors that can occur while writing the optional Parquet copy of the processed papers
+try:
+    from pyarrow.lib import ArrowException
+    PARQUET_WRITE_ERRORS = (ImportError, ValueError, OSError, ArrowException)
+except ImportError:
+    PARQUET_WRITE_ERRORS = (ImportError, ValueError, OSError)
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -244,6 +251,7 @@ def main():
         EMBEDDINGS_PATH,
         BERTOPIC_MODEL_PATH,
         PROCESSED_PAPERS_CSV,
+        PROCESSED_PAPERS_PARQUET,
         TOPICS_OVER_TIME_CSV,
         METADATA_CSV,
         NR_TIME_BINS
@@ -294,6 +302,15 @@ def main():
     metadata['topic_probability'] = [p.max() if len(p) > 0 else 0 for p in probs]
     metadata.to_csv(PROCESSED_PAPERS_CSV, index=False)
     logger.info(f"[OK] Saved papers with topics to {PROCESSED_PAPERS_CSV}")
+    # Columnar copy for the dashboard, which loads it in preference to the CSV
+    try:
+        metadata.to_parquet(PROCESSED_PAPERS_PARQUET, compression="zstd", index=False)
+        logger.info(f"[OK] Saved Parquet copy to {PROCESSED_PAPERS_PARQUET}")
+    except PARQUET_WRITE_ERRORS as e:
+        # The CSV is already written; drop any partial Parquet file so the dashboard reads the CSV
+        if os.path.exists(PROCESSED_PAPERS_PARQUET):
+            os.remove(PROCESSED_PAPERS_PARQUET)
+        logger.warning(f"Could not write Parquet copy of processed papers ({e}); the dashboard will use the CSV")
     
     # Save temporal data
     topics_over_time.to_csv(TOPICS_OVER_TIME_CSV, index=False)
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+from dashboard.utils.caching import frame_fingerprint, series_fingerprint
+
+
+def _papers():
+    return pd.DataFrame({
+        'title': ['Graph networks', 'Edge computing', 'Swarm robotics'],
+        'theme': pd.Categorical(['AI', 'AI', 'Autonomous']),
+        'citations': [3, 10, 0],
+        'date': pd.to_datetime(['2023-01-01', '2024-05-01', None]),
+    })
+
+
+def test_frame_fingerprint_is_stable():
+    assert frame_fingerprint(_papers()) == frame_fingerprint(_papers())
+
+
+def test_frame_fingerprint_sees_object_columns():
+    df = _papers()
+    other = df.copy()
+    other.loc[1, 'title'] = 'Fog computing'
+    assert frame_fingerprint(df) != frame_fingerprint(other)
+
+
+def test_frame_fingerprint_sees_rows_values_and_columns():
+    df = _papers()
+    base = frame_fingerprint(df)
+    assert frame_fingerprint(df.iloc[:2]) != base
+    assert frame_fingerprint(df.iloc[[1, 0, 2]]) != base
+    assert frame_fingerprint(df.assign(citations=[3, 11, 0])) != base
+    assert frame_fingerprint(df.assign(theme=pd.Categorical(['AI', 'Autonomous', 'Autonomous']))) != base
+    assert frame_fingerprint(df.rename(columns={'citations': 'cites'})) != base
+
+
+def test_series_fingerprint():
+    s = pd.Series(['a', 'b', None], name='sub_theme')
+    assert series_fingerprint(s) == series_fingerprint(s.copy())
+    assert series_fingerprint(s) != series_fingerprint(s.rename('theme'))
+    assert series_fingerprint(s) != series_fingerprint(pd.Series(['a', 'c', None], name='sub_theme'))
+    assert series_fingerprint(pd.Series([1.0, np.nan])) != series_fingerprint(pd.Series([1.0, 2.0]))
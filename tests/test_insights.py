@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+
+from dashboard.utils.insights import _score_topics, _topic_label_request_body, generate_topic_cache_key
+
+
+def test_label_request_body_without_sub_theme():
+    keywords = ['graph', 'neural', 'network', 'embedding']
+    # A topic with no sub-theme reads back as NaN from the categorical column, or as None
+    for missing in (np.nan, None, ''):
+        body, domain, clean_keywords = _topic_label_request_body(keywords, 'AI_Machine_Learning', missing, 12, 35.0)
+        prompt = body['messages'][-1]['content']
+        assert 'Sub-area' not in prompt
+        assert domain == 'Ai Machine Learning'
+        assert clean_keywords == keywords
+
+    body, _, _ = _topic_label_request_body(keywords, 'AI_Machine_Learning', 'Deep_Learning', 12, 35.0)
+    assert 'Sub-area: Deep Learning' in body['messages'][-1]['content']
+
+
+def test_cache_key_treats_missing_sub_theme_alike():
+    keywords = ['graph', 'neural']
+    assert generate_topic_cache_key(keywords, 'AI', np.nan) == generate_topic_cache_key(keywords, 'AI', None)
+    assert generate_topic_cache_key(keywords, 'AI', None) != generate_topic_cache_key(keywords, 'AI', 'Vision')
+    # Keyword order does not matter
+    assert generate_topic_cache_key(['b', 'a'], 'AI', None) == generate_topic_cache_key(['a', 'b'], 'AI', None)
+
+
+def test_request_topic_label_failures_return_none(monkeypatch, capsys):
+    import sys
+    import types
+    from dashboard.utils import insights
+
+    openai_module = sys.modules['openai']
+    error = type('OpenAIError', (Exception,), {})
+    monkeypatch.setattr(openai_module, 'OpenAIError', error, raising=False)
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+
+    def failing_create(**body):
+        raise error('rate limited')
+
+    client = types.SimpleNamespace(chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=failing_create)))
+    monkeypatch.setattr(insights, '_openai_client', lambda api_key: client)
+    args = dict(keywords=['graph', 'neural', 'network'], theme='AI_Machine_Learning', sub_theme=np.nan,
+                paper_count=12, growth_rate=35.0)
+    assert insights._request_topic_label(**args) is None
+    assert 'rate limited' in capsys.readouterr().out
+
+    def reply(**body):
+        message = types.SimpleNamespace(content='"Graph Neural Networks"')
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)])
+
+    client.chat.completions.create = reply
+    assert insights._request_topic_label(**args) == 'Graph Neural Networks'
+
+    monkeypatch.delenv('OPENAI_API_KEY')
+    assert insights._request_topic_label(**args) is None
+
+
+def _reference_topic_scores(df):
+    """The original per-topic loop that _score_topics replaced."""
+    latest_date = df['date'].max()
+    rows = []
+    for topic_id in df['topic_id'].unique():
+        if topic_id == -1:
+            continue
+        topic_papers = df[df['topic_id'] == topic_id]
+        if len(topic_papers) < 5:
+            continue
+        months_old = (latest_date - topic_papers['date']).dt.days / 30
+        recency_score = np.exp(-months_old.mean() / 12)
+        quarterly_counts = topic_papers.groupby(topic_papers['date'].dt.to_period('Q')).size().sort_index()
+        if len(quarterly_counts) >= 4:
+            recent_avg = quarterly_counts.iloc[-2:].mean()
+            older_avg = quarterly_counts.iloc[-4:-2].mean()
+            growth_rate = ((recent_avg - older_avg) / max(older_avg, 1)) * 100
+        elif len(quarterly_counts) >= 2:
+            growth_rate = ((quarterly_counts.iloc[-1] - quarterly_counts.iloc[0]) / max(quarterly_counts.iloc[0], 1)) * 100
+        else:
+            growth_rate = 0
+        rows.append({
+            'topic_id': topic_id,
+            'theme': topic_papers['theme'].iloc[0],
+            'sub_theme': topic_papers['sub_theme'].iloc[0],
+            'recency_score': recency_score,
+            'growth_rate': growth_rate,
+            'paper_count': len(topic_papers),
+            'avg_citations': topic_papers['citations'].mean(),
+        })
+    return pd.DataFrame(rows)
+
+
+def _scoring_frame():
+    rng = np.random.default_rng(7)
+    n = 120
+    # Topic 3 only has 4 papers and -1 is the outlier topic; both are dropped
+    topic_ids = np.concatenate([rng.choice([0, 1, 2, -1], size=n - 4), [3] * 4])
+    dates = pd.Timestamp('2022-01-01') + pd.to_timedelta(rng.integers(0, 900, size=n), unit='D')
+    # Topic 2 sits in one quarter, topic 1 in three, so every growth branch is exercised
+    dates = np.where(topic_ids == 2, pd.Timestamp('2024-02-10'), dates)
+    dates = np.where(topic_ids == 1, pd.Timestamp('2023-01-01') + pd.to_timedelta(rng.integers(0, 250, size=n), unit='D'), dates)
+    df = pd.DataFrame({
+        'topic_id': topic_ids,
+        'date': pd.to_datetime(dates),
+        'theme': [f'Theme_{t % 2}' for t in topic_ids],
+        'sub_theme': [None if t == 0 else f'Sub_{t}' for t in topic_ids],
+        'citations': rng.integers(0, 50, size=n).astype(float),
+    })
+    df.loc[::9, 'citations'] = np.nan
+    return df
+
+
+def test_score_topics_matches_per_topic_loop():
+    df = _scoring_frame()
+    expected = _reference_topic_scores(df)
+    with_quarter = df.assign(quarter=pd.Categorical(
+        df['date'].dt.to_period('Q').astype(str),
+        categories=sorted(df['date'].dt.to_period('Q').astype(str).unique()),
+        ordered=True,
+    ))
+    for frame in (df, with_quarter):
+        result = pd.DataFrame(_score_topics(frame))
+        assert list(result['topic_id']) == list(expected['topic_id'])
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
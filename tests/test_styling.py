@@ -0,0 +1,36 @@
+import math
+
+import pytest
+
+from dashboard.utils.styling import _GROWTH_COLOR_BUCKETS, get_growth_color_style, pretty_name
+
+
+@pytest.mark.parametrize("growth_rate, icon, border, label", [
+    (1.2, "▲▲", "#10b981", "+120%"),
+    (0.50, "▲▲", "#10b981", "+50%"),
+    (0.499, "▲", "#34d399", "+50%"),
+    (0.20, "▲", "#34d399", "+20%"),
+    (0.05, "▲", None, "+5%"),
+    (0.0, "→", None, "+0.0%"),
+    (-0.05, "→", None, "-5.0%"),
+    (-0.20, "▼", None, "-20%"),
+    (-0.21, "▼▼", None, "-21%"),
+])
+def test_growth_color_buckets(growth_rate, icon, border, label):
+    style = get_growth_color_style(growth_rate)
+    assert style["icon"] == icon
+    assert style["label"] == label
+    if border is not None:
+        assert style["border"] == border
+    assert set(style) == {"bg", "border", "icon", "color", "icon_color", "label"}
+
+
+def test_growth_color_table_order_and_nan():
+    bounds = [bound for bound, _, _ in _GROWTH_COLOR_BUCKETS]
+    assert bounds == sorted(bounds, reverse=True)
+    assert math.isinf(bounds[-1])
+    assert get_growth_color_style(float("nan"))["icon"] == _GROWTH_COLOR_BUCKETS[-1][1]["icon"]
+
+
+def test_pretty_name():
+    assert pretty_name("AI_Machine_Learning") == "Ai Machine Learning"
@@ -0,0 +1,75 @@
+import math
+
+import pandas as pd
+import pytest
+
+from dashboard.tabs.theme_analysis_tab import (
+    _GROWTH_STYLE_BUCKETS,
+    find_adjacent_themes,
+    get_growth_color_style_theme,
+)
+
+
+def _reference_adjacent_themes(papers, theme_key, mapping_obj):
+    """The original per-paper loop find_adjacent_themes replaced."""
+    adjacent = {}
+    for _, p in papers[papers["theme"] == theme_key].iterrows():
+        kw = set(mapping_obj.get(str(p["topic_id"]), {}).get("keywords", []))
+        for data in mapping_obj.values():
+            other_theme = data.get("theme")
+            if not other_theme or other_theme in (theme_key, "Other"):
+                continue
+            overlap = len(kw & set(data.get("keywords", [])))
+            if overlap > 0:
+                adjacent[other_theme] = adjacent.get(other_theme, 0) + overlap
+    return adjacent
+
+
+def test_find_adjacent_themes_matches_per_paper_loop():
+    mapping = {
+        "0": {"theme": "AI", "keywords": ["neural", "graph", "vision"]},
+        "1": {"theme": "AI", "keywords": ["language", "graph"]},
+        "2": {"theme": "Cyber", "keywords": ["graph", "intrusion", "neural"]},
+        "3": {"theme": "Robotics", "keywords": ["vision", "control"]},
+        "4": {"theme": "Other", "keywords": ["neural"]},
+        "5": {"theme": "Energy", "keywords": ["grid"]},
+    }
+    papers = pd.DataFrame({
+        "theme": pd.Categorical(["AI", "AI", "AI", "Cyber", "AI"]),
+        "topic_id": pd.Categorical([0, 0, 1, 2, 7]),  # topic 7 has no mapping entry
+    })
+
+    result = find_adjacent_themes(papers, "AI", mapping, k=5)
+    expected = _reference_adjacent_themes(papers, "AI", mapping)
+    assert dict(result) == expected == {"Cyber": 5, "Robotics": 2}
+    assert result == [("Cyber", 5), ("Robotics", 2)]
+    assert find_adjacent_themes(papers, "AI", mapping, k=1) == [("Cyber", 5)]
+    assert find_adjacent_themes(papers, "Energy", mapping) == []
+
+
+@pytest.mark.parametrize("growth_rate, icon, label", [
+    (0.75, "▲▲", "+75%"),
+    (0.50, "▲▲", "+50%"),
+    (0.30, "▲", "+30%"),
+    (0.05, "▲", "+5%"),
+    (0.0, "→", "+0.0%"),
+    (-0.03, "→", "-3.0%"),
+    (-0.05, "→", "-5.0%"),
+    (-0.10, "▼", "-10%"),
+    (-0.20, "▼", "-20%"),
+    (-0.45, "▼▼", "-45%"),
+])
+def test_growth_style_buckets(growth_rate, icon, label):
+    style = get_growth_color_style_theme(growth_rate)
+    assert style["icon"] == icon
+    assert style["label"] == label
+
+
+def test_growth_style_table_order_and_nan():
+    bounds = [bound for bound, _, _ in _GROWTH_STYLE_BUCKETS]
+    assert bounds == sorted(bounds, reverse=True)
+    assert math.isinf(bounds[-1])
+    # NaN growth fails every comparison and falls back to the last bucket
+    nan_style = get_growth_color_style_theme(float("nan"))
+    assert nan_style["icon"] == _GROWTH_STYLE_BUCKETS[-1][1]["icon"]
+    assert nan_style["label"] == "nan%"